@@ -1,38 +1,108 @@
 """聊天历史数据库管理器 - 使用 SQLite"""
 
-import re
 import sqlite3
 import threading
 import time
+import uuid
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+from urllib.parse import urlsplit
+from urllib.request import url2pathname
 
 from backend.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
-# Pre-compile session ID validation regex
-# 只允许字母数字、下划线、连字符，长度限制在 1-64 字符
-SESSION_ID_PATTERN = re.compile(r"^[a-zA-Z0-9_-]{1,64}$")  # 会话 ID 验证正则
+# 会话 ID 只允许 ASCII 字母数字、下划线、连字符，长度限制在 1-64 字符
+SESSION_ID_MAX_LENGTH = 64
+
+# 热路径 SQL 使用固定的参数化文本，命中 sqlite3 连接内的预编译语句缓存
+_STATEMENT_CACHE_SIZE = 256
+
+_SQL_ENSURE_SESSION = (
+    "INSERT OR IGNORE INTO sessions "
+    "(session_id, title, created_at, updated_at, message_count) "
+    "VALUES (?, ?, ?, ?, 0)"
+)
+# messages 以 (session_id, seq) 聚簇存储，seq 为会话内从 1 开始的消息序号
+_SQL_INSERT_MSG = (
+    "INSERT INTO messages (session_id, seq, role, content, timestamp) "
+    "VALUES (?, (SELECT COALESCE(MAX(seq), 0) + 1 FROM messages "
+    "WHERE session_id = ?), ?, ?, ?)"
+)
+_SQL_SELECT_MSGS = (
+    "SELECT role, content, timestamp FROM messages WHERE session_id = ? ORDER BY seq"
+)
+_SQL_CREATE_MESSAGES = """
+    CREATE TABLE IF NOT EXISTS messages (
+        session_id TEXT NOT NULL,
+        seq INTEGER NOT NULL,
+        role TEXT,
+        content TEXT,
+        timestamp REAL,
+        PRIMARY KEY (session_id, seq),
+        FOREIGN KEY (session_id) REFERENCES sessions(session_id)
+            ON DELETE CASCADE
+    ) WITHOUT ROWID
+"""
+_SQL_SHIFT_MSGS_FOR_LEGACY = """
+    UPDATE messages SET seq = -(seq + (
+        SELECT COUNT(*) FROM messages_legacy AS l
+        WHERE l.session_id = messages.session_id
+    ))
+"""
+_SQL_MIGRATE_LEGACY_MSGS = """
+    INSERT INTO messages (session_id, seq, role, content, timestamp)
+    SELECT session_id,
+           ROW_NUMBER() OVER (PARTITION BY session_id ORDER BY timestamp, id),
+           role, content, timestamp
+    FROM messages_legacy
+    WHERE session_id IS NOT NULL
+"""
+_SQL_SELECT_MSGS_LIMIT = _SQL_SELECT_MSGS + " LIMIT ?"
+_SQL_EXISTS = "SELECT 1 FROM sessions WHERE session_id = ?"
 
 
 class ChatHistoryDB:
     """基于 SQLite 的聊天历史存储"""
 
-    def __init__(self, db_path: Optional[str] = None):
+    def __init__(self, db_path: Optional[Union[str, Path]] = None):
         """初始化数据库连接
 
         Args:
-            db_path: SQLite 数据库文件路径，默认为 data/chat_history.db
+            db_path: SQLite 数据库文件路径，默认为 data/chat_history.db；
+                传入 ":memory:" 使用内存数据库（不落盘，适用于测试）；
+                以 "file:" 开头时按 SQLite URI 打开，可携带 cache=shared 等参数
         """
         if db_path is None:
             # Default location: data/chat_history.db
             base_dir = Path(__file__).parent.parent.parent
-            db_path = str(base_dir / "data" / "chat_history.db")
+            db_path = base_dir / "data" / "chat_history.db"
 
+        # 同时接受 str 与 pathlib.Path，统一为字符串后再判断特殊形式
+        db_path = str(db_path)
         self.db_path = Path(db_path)
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # 非空时以 URI 方式打开连接
+        self._uri: Optional[str] = None
+        # 内存数据库：连接是线程本地的，普通 ":memory:" 每个连接各自独立，
+        # 因此改用实例唯一的共享缓存 URI，并保留一个锚定连接维持数据库存活
+        self._memory_anchor: Optional[sqlite3.Connection] = None
+        if db_path == ":memory:":
+            self._uri = f"file:chat_history_{uuid.uuid4().hex}?mode=memory&cache=shared"
+            self._memory_anchor = sqlite3.connect(
+                self._uri, uri=True, check_same_thread=False
+            )
+        else:
+            if db_path.startswith("file:"):
+                self._uri = db_path
+                # file:///C:/a%20b.db 这类 URI 需解码并转换为本地路径
+                self.db_path = Path(url2pathname(urlsplit(db_path).path))
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # 时间源，测试可替换为确定性的时钟
+        self._clock: Callable[[], float] = time.time
 
         # Thread-local storage for connections
         self._local = threading.local()
@@ -76,14 +146,36 @@ class ChatHistoryDB:
         """获取线程本地数据库连接"""
         if not hasattr(self._local, "conn") or self._local.conn is None:
             self._local.conn = sqlite3.connect(
-                str(self.db_path), check_same_thread=False
+                self._uri if self._uri is not None else str(self.db_path),
+                uri=self._uri is not None,
+                check_same_thread=False,
+                cached_statements=_STATEMENT_CACHE_SIZE,
             )
             self._local.conn.row_factory = sqlite3.Row
+            self._configure_connection(self._local.conn)
             # 记录连接以便后续统一关闭
             with self._connections_lock:
                 self._all_connections.append(self._local.conn)
         return self._local.conn
 
+    def _configure_connection(self, conn: sqlite3.Connection) -> None:
+        """设置连接级 PRAGMA
+
+        WAL 模式下每次提交少一次 fsync，且读写可并发；synchronous=NORMAL
+        在 WAL 下仍保证崩溃一致性。journal_mode 会持久化到数据库文件，
+        synchronous 仅对当前连接生效，因此每个新连接都需设置。
+        内存数据库不支持 WAL，跳过。
+        """
+        if self._memory_anchor is not None:
+            return
+        try:
+            mode = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+            if mode.lower() != "wal":
+                logger.warning(f"SQLite 未能启用 WAL 模式，当前模式：{mode}")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        except sqlite3.Error as e:
+            logger.warning(f"设置 SQLite PRAGMA 失败：{e}")
+
     def close(self) -> None:
         """关闭当前线程的数据库连接"""
         if hasattr(self._local, "conn") and self._local.conn is not None:
@@ -114,12 +206,23 @@ class ChatHistoryDB:
         """析构时确保连接被关闭"""
         try:
             self.close_all()
+            # 内存数据库随锚定连接关闭而释放
+            if self._memory_anchor is not None:
+                self._memory_anchor.close()
+                self._memory_anchor = None
         except Exception:
             pass  # 静默忽略析构时的异常
 
     def _init_db(self):
-        """初始化数据库表"""
+        """初始化数据库表
+
+        建表与旧版 messages 表迁移放在同一个显式事务中。sqlite3 模块只在
+        DML 前隐式开启事务，若不显式 BEGIN，迁移中的 DDL 会各自自动提交，
+        中途失败将留下空的新表和孤立的 messages_legacy。
+        """
         with self.get_cursor() as cursor:
+            cursor.execute("BEGIN")
+
             # Sessions table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS sessions (
@@ -131,30 +234,45 @@ class ChatHistoryDB:
                 )
             """)
 
+            # 旧版本的 messages 使用自增 id 主键，需迁移到聚簇主键
+            cursor.execute("PRAGMA table_info(messages)")
+            columns = {row["name"] for row in cursor.fetchall()}
+            if "id" in columns:
+                cursor.execute("DROP INDEX IF EXISTS idx_messages_session_id")
+                cursor.execute("ALTER TABLE messages RENAME TO messages_legacy")
+
             # Messages table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS messages (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    session_id TEXT,
-                    role TEXT,
-                    content TEXT,
-                    timestamp REAL,
-                    FOREIGN KEY (session_id) REFERENCES sessions(session_id)
-                        ON DELETE CASCADE
-                )
-            """)
+            # 消息总是按会话读取并按顺序返回，(session_id, seq) 聚簇主键
+            # 让同一会话的消息在 B 树中连续存放，无需额外的 session_id 索引
+            cursor.execute(_SQL_CREATE_MESSAGES)
 
-            # Index for faster queries
+            # 残留的 messages_legacy 既可能来自本次重命名，也可能是
+            # 旧版本非原子迁移中断后留下的，两种情况都从这里继续迁移
             cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_messages_session_id "
-                "ON messages(session_id)"
+                "SELECT 1 FROM sqlite_master "
+                "WHERE type = 'table' AND name = 'messages_legacy'"
             )
+            if cursor.fetchone() is not None:
+                self._migrate_legacy_messages(cursor)
 
             cursor.execute(
                 "CREATE INDEX IF NOT EXISTS idx_sessions_updated_at "
                 "ON sessions(updated_at)"
             )
 
+    def _migrate_legacy_messages(self, cursor: sqlite3.Cursor) -> None:
+        """将 messages_legacy 中的消息并入 messages 并删除旧表
+
+        旧消息早于新表中已有的消息（中断后写入的），因此先把新表中每条
+        消息的 seq 后移该会话的旧消息条数，再按时间顺序写入旧消息。
+        主键冲突按行检查，后移分两步经由负数完成，避免中途撞上未移动的行。
+        """
+        cursor.execute(_SQL_SHIFT_MSGS_FOR_LEGACY)
+        cursor.execute("UPDATE messages SET seq = -seq WHERE seq < 0")
+        cursor.execute(_SQL_MIGRATE_LEGACY_MSGS)
+        cursor.execute("DROP TABLE messages_legacy")
+        logger.info("messages 表已迁移为 (session_id, seq) 聚簇主键")
+
     def _validate_session_id(self, session_id: str) -> bool:
         """验证会话 ID 格式
 
@@ -166,10 +284,15 @@ class ChatHistoryDB:
         """
         if not session_id or not isinstance(session_id, str):
             return False
-        if len(session_id) > 64:
+        if len(session_id) > SESSION_ID_MAX_LENGTH:
             return False
-        # Allow alphanumeric, underscore, hyphen, and some safe characters
-        return bool(SESSION_ID_PATTERN.match(session_id))
+        # 字符集检查全部由 C 实现的 str 方法完成，无需正则引擎：
+        # isascii 排除全角/非拉丁字母，下划线和连字符替换为字母后交给 isalnum，
+        # 空白、换行及其他标点都会使 isalnum 返回 False
+        return (
+            session_id.isascii()
+            and session_id.replace("_", "a").replace("-", "a").isalnum()
+        )
 
     def create_session(self, session_id: str, title: Optional[str] = None) -> bool:
         """创建新会话
@@ -185,7 +308,7 @@ class ChatHistoryDB:
             return False
 
         with self.get_cursor() as cursor:
-            now = time.time()
+            now = self._clock()
             cursor.execute(
                 """
                 INSERT OR IGNORE INTO sessions
@@ -211,24 +334,15 @@ class ChatHistoryDB:
             return False
 
         with self.get_cursor() as cursor:
-            now = time.time()
+            now = self._clock()
 
             # 优化：使用 INSERT OR IGNORE 自动创建会话（如果不存在）
             # 这样可以避免先查询再创建的两次数据库操作
-            cursor.execute(
-                "INSERT OR IGNORE INTO sessions "
-                "(session_id, title, created_at, updated_at, message_count) "
-                "VALUES (?, ?, ?, ?, 0)",
-                (session_id, "新对话", now, now),
-            )
+            cursor.execute(_SQL_ENSURE_SESSION, (session_id, "新对话", now, now))
 
             # 添加消息
             cursor.execute(
-                """
-                INSERT INTO messages (session_id, role, content, timestamp)
-                VALUES (?, ?, ?, ?)
-            """,
-                (session_id, role, content, now),
+                _SQL_INSERT_MSG, (session_id, session_id, role, content, now)
             )
 
             # 更新会话
@@ -263,6 +377,70 @@ class ChatHistoryDB:
 
             return True
 
+    def add_messages_bulk(
+        self, session_id: str, messages: Sequence[Tuple[str, str]]
+    ) -> bool:
+        """在单个事务中批量添加消息
+
+        语义与逐条调用 add_message 一致（自动创建会话、更新计数与标题），
+        但整批只提交一次。
+
+        Args:
+            session_id: 会话标识符
+            messages: (role, content) 元组序列
+
+        Returns:
+            添加成功返回 True
+        """
+        if not self._validate_session_id(session_id):
+            return False
+        if not messages:
+            return True
+
+        with self.get_cursor() as cursor:
+            now = self._clock()
+
+            cursor.execute(_SQL_ENSURE_SESSION, (session_id, "新对话", now, now))
+
+            # 标题只取会话的第一条用户消息，需在插入前判断
+            cursor.execute(
+                "SELECT 1 FROM messages WHERE session_id = ? AND role = 'user' LIMIT 1",
+                (session_id,),
+            )
+            has_user_message = cursor.fetchone() is not None
+
+            cursor.executemany(
+                _SQL_INSERT_MSG,
+                [
+                    (session_id, session_id, role, content, now)
+                    for role, content in messages
+                ],
+            )
+
+            cursor.execute(
+                "UPDATE sessions "
+                "SET message_count = message_count + ?, updated_at = ? "
+                "WHERE session_id = ?",
+                (len(messages), now, session_id),
+            )
+
+            if not has_user_message:
+                first_user = next(
+                    (content for role, content in messages if role == "user"), None
+                )
+                if first_user is not None:
+                    clean_content = " ".join(first_user.split())
+                    if len(clean_content) > 50:
+                        title = clean_content[:50] + "..."
+                    else:
+                        title = clean_content
+                    cursor.execute(
+                        "UPDATE sessions SET title = ? WHERE session_id = ?",
+                        (title, session_id),
+                    )
+
+            return True
+
     def get_session_messages(
         self, session_id: str, limit: Optional[int] = None
     ) -> List[Dict[str, Any]]:
@@ -280,26 +458,9 @@ class ChatHistoryDB:
 
         with self.get_cursor() as cursor:
             if limit:
-                cursor.execute(
-                    """
-                    SELECT role, content, timestamp
-                    FROM messages
-                    WHERE session_id = ?
-                    ORDER BY timestamp
-                    LIMIT ?
-                """,
-                    (session_id, limit),
-                )
+                cursor.execute(_SQL_SELECT_MSGS_LIMIT, (session_id, limit))
             else:
-                cursor.execute(
-                    """
-                    SELECT role, content, timestamp
-                    FROM messages
-                    WHERE session_id = ?
-                    ORDER BY timestamp
-                """,
-                    (session_id,),
-                )
+                cursor.execute(_SQL_SELECT_MSGS, (session_id,))
 
             rows = cursor.fetchall()
             return [dict(row) for row in rows]
@@ -326,7 +487,7 @@ class ChatHistoryDB:
                     """
                     SELECT content FROM messages
                     WHERE session_id = ? AND role = 'assistant'
-                    ORDER BY timestamp DESC
+                    ORDER BY seq DESC
                     LIMIT 1
                 """,
                     (session["session_id"],),
@@ -381,7 +542,7 @@ class ChatHistoryDB:
             cursor.execute(
                 "UPDATE sessions SET message_count = 0, updated_at = ? "
                 "WHERE session_id = ?",
-                (time.time(), session_id),
+                (self._clock(), session_id),
             )
             return True
 
@@ -398,7 +559,7 @@ class ChatHistoryDB:
             return False
 
         with self.get_cursor() as cursor:
-            cursor.execute("SELECT 1 FROM sessions WHERE session_id = ?", (session_id,))
+            cursor.execute(_SQL_EXISTS, (session_id,))
             return cursor.fetchone() is not None
 
     def cleanup_old_sessions(
@@ -422,7 +583,7 @@ class ChatHistoryDB:
             cursor.execute("BEGIN TRANSACTION")
             try:
                 # 1. 删除超过 max_age_days 天的旧会话
-                cutoff_time = time.time() - (max_age_days * 24 * 3600)
+                cutoff_time = self._clock() - (max_age_days * 24 * 3600)
                 cursor.execute(
                     "DELETE FROM sessions WHERE updated_at < ?", (cutoff_time,)
                 )
@@ -5,6 +5,8 @@
 import atexit
 import logging
 import os
+import shutil
+import subprocess
 from concurrent.futures import ThreadPoolExecutor
 from concurrent.futures import TimeoutError as FutureTimeoutError
 from functools import wraps
@@ -62,6 +64,14 @@ except ImportError:
     textract = None
 import datetime
 
+# textract 对这些格式只是转调命令行工具，直接调用可省去其分派层和额外的进程包装；
+# 命令末尾追加文件路径，纯文本输出到 stdout
+_CLI_EXTRACTORS = {
+    "doc": ("antiword",),
+    "ps": ("ps2ascii",),
+}
+_CLI_EXTRACT_TIMEOUT = 20  # 秒，与通用解析器的超时一致
+
 try:
     import win32com.client
 except ImportError as e:
@@ -585,7 +595,10 @@ class DocumentParser:
     def _parse_doc_win32(self, file_path):
         """使用win32com解析.doc文件 (仅Windows, 10秒超时)"""
         if not win32com:
-            # 尝试使用textract作为后备
+            # 尝试直接调用 antiword，再使用textract作为后备
+            text = self._extract_with_cli(file_path)
+            if text is not None:
+                return text
             if textract:
                 try:
                     return textract.process(file_path).decode("utf-8", errors="ignore")
@@ -632,7 +645,10 @@ class DocumentParser:
 
             self.logger.error(f"Win32解析.doc失败 {file_path}: {str(e)}")
 
-            # 尝试使用textract作为最后的后备
+            # 尝试直接调用 antiword，再使用textract作为最后的后备
+            text = self._extract_with_cli(file_path)
+            if text is not None:
+                return text
             if textract:
                 try:
                     return textract.process(file_path).decode("utf-8", errors="ignore")
@@ -855,6 +871,33 @@ class DocumentParser:
             # 如果没有textract或解析失败，返回错误信息
             return f"错误: 无法解析Excel内容\n{str(e)}"
 
+    def _extract_with_cli(self, file_path):
+        """直接调用命令行工具提取文本
+
+        Returns:
+            提取到的文本；格式不在 _CLI_EXTRACTORS 中、工具未安装或执行失败时
+            返回 None，由调用方继续走 textract 后备
+        """
+        file_ext = os.path.splitext(file_path)[1].lower()[1:]
+        command = _CLI_EXTRACTORS.get(file_ext)
+        if not command or shutil.which(command[0]) is None:
+            return None
+        try:
+            result = subprocess.run(
+                [*command, file_path],
+                capture_output=True,
+                timeout=_CLI_EXTRACT_TIMEOUT,
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            self.logger.warning(f"{command[0]} 解析失败 {file_path}: {str(e)}")
+            return None
+        if result.returncode != 0:
+            self.logger.warning(
+                f"{command[0]} 解析失败 {file_path}: 退出码 {result.returncode}"
+            )
+            return None
+        return result.stdout.decode("utf-8", errors="ignore")
+
     @timeout(20)
     def _parse_generic(self, file_path):
         """通用解析器，用于处理不支持的文件格式"""
@@ -912,7 +955,10 @@ class DocumentParser:
         ):
             return ""
 
-        # 使用textract尝试提取内容
+        # 优先直接调用命令行工具，其余格式交给textract分派
+        text = self._extract_with_cli(file_path)
+        if text is not None:
+            return text
         if textract:
             try:
                 return textract.process(file_path).decode("utf-8", errors="ignore")
@@ -6,7 +6,7 @@
 import hashlib
 import re
 from collections import OrderedDict
-from typing import List, Tuple
+from typing import List, Set, Tuple
 
 from backend.utils.logger import setup_logger
 
@@ -32,16 +32,34 @@ SENSITIVE_PATTERNS = {
     ),
 }
 
+# 所有规则合并为一个命名分组的交替式，文本只需扫描一遍，由 lastgroup 判断类型。
+# 同一位置按 SENSITIVE_PATTERNS 的顺序优先匹配，与原先逐类替换的优先级一致。
+_COMBINED_PATTERN = re.compile(
+    "|".join(
+        f"(?P<{ptype}>{pattern})" for ptype, (pattern, _) in SENSITIVE_PATTERNS.items()
+    )
+)
+
+# 预筛：每条规则都至少包含一个数字或 "@"，不含二者的文本（大部分普通对话）
+# 可直接跳过多分支扫描，单字符类的扫描开销约为合并正则的 1/15
+_CANDIDATE_PATTERN = re.compile(r"[\d@]")
+
+# 脱敏标记 [***XXX***:hash] (8字节 BLAKE2b 的16位十六进制)，同样合并为一次扫描
+_MARKER_PATTERN = re.compile(
+    r"\[(?:"
+    + "|".join(re.escape(placeholder) for _, placeholder in SENSITIVE_PATTERNS.values())
+    + r"):([a-f0-9]{16})\]"
+)
+
 
 class PrivacyGuard:
     """隐私保护守卫 - 始终启用"""
 
     def __init__(self, max_map_size: int = 1000):
         self.patterns = SENSITIVE_PATTERNS
-        # 使用OrderedDict实现O(1)的LRU操作
+        # 哈希键 -> 原文；OrderedDict 的插入顺序即 LRU 顺序，命中与淘汰均为 O(1)
         self._mask_map: OrderedDict[str, str] = OrderedDict()
         self._max_map_size = max_map_size
-        self._access_order: List[str] = []
 
     def detect_sensitive(self, text: str) -> List[Tuple[str, str, str]]:
         """
@@ -50,15 +68,22 @@ class PrivacyGuard:
         Returns:
             List of (类型, 原文, 位置) 元组
         """
-        findings: list[tuple[str, str, str]] = []
-        for ptype, (pattern, _) in self.patterns.items():
-            for match in re.finditer(pattern, text):
-                findings.append((ptype, match.group(), str(match.span())))
-        return findings
-
-    def _cleanup_old_mappings(self):
-        """LRU清理：当映射表过大时清理最旧的条目（使用OrderedDict实现O(1)）"""
-        while len(self._mask_map) > self._max_map_size:
+        if not _CANDIDATE_PATTERN.search(text):
+            return []
+        return [
+            (match.lastgroup, match.group(), str(match.span()))
+            for match in _COMBINED_PATTERN.finditer(text)
+        ]
+
+    def _cleanup_old_mappings(self, keep: int = 0):
+        """LRU清理：当映射表过大时清理最旧的条目（使用OrderedDict实现O(1)）
+
+        Args:
+            keep: 必须保留的最新条目数，本次 redact 签发的标记都在表尾，
+                即使超出上限也不淘汰，保证返回的文本可以完整还原
+        """
+        limit = max(self._max_map_size, keep)
+        while len(self._mask_map) > limit:
             # OrderedDict的popitem(last=False)是O(1)操作
             self._mask_map.popitem(last=False)
 
@@ -72,30 +97,27 @@ class PrivacyGuard:
         Returns:
             脱敏后的文本
         """
-        if not text:
+        if not text or not _CANDIDATE_PATTERN.search(text):
             return text
 
-        # 检查是否需要清理
-        if len(self._mask_map) > self._max_map_size:
-            self._cleanup_old_mappings()
-
-        result = text
-        for ptype, (pattern, placeholder) in self.patterns.items():
-
-            def replace_func(match):
-                original = match.group()
-                # 使用哈希记录映射关系，便于后续还原（如需要）
-                key = hashlib.sha256(original.encode()).hexdigest()[:16]
-                self._mask_map[key] = original
-                # 更新访问顺序
-                if key in self._access_order:
-                    self._access_order.remove(key)
-                self._access_order.append(key)
-                return f"[{placeholder}:{key}]"
-
-            result = re.sub(pattern, replace_func, result)
-
-        return result
+        issued: Set[str] = set()
+        redacted = _COMBINED_PATTERN.sub(lambda match: self._mask(match, issued), text)
+        # 整段替换完成后再统一淘汰，避免扫描中途淘汰本次已签发的标记
+        self._cleanup_old_mappings(keep=len(issued))
+        return redacted
+
+    def _mask(self, match: "re.Match[str]", issued: Set[str]) -> str:
+        """将单个敏感信息匹配替换为占位符，记录映射关系及本次签发的键"""
+        original = match.group()
+        placeholder = self.patterns[match.lastgroup][1]
+        # 键由原文哈希得到，相同原文复用同一占位符，便于后续还原（如需要）
+        key = hashlib.blake2b(original.encode(), digest_size=8).hexdigest()
+        if key in self._mask_map:
+            self._mask_map.move_to_end(key)
+        else:
+            self._mask_map[key] = original
+        issued.add(key)
+        return f"[{placeholder}:{key}]"
 
     def restore(self, text: str) -> str:
         """
@@ -110,21 +132,15 @@ class PrivacyGuard:
         if not text:
             return text
 
-        result = text
-        for ptype, (pattern, placeholder) in self.patterns.items():
-            # 匹配 [***XXX***:hash] 格式 (SHA256前16位)
-            marker_pattern = rf"\[{re.escape(placeholder)}:([a-f0-9]{{16}})\]"
-
-            def restore_func(match):
-                key = match.group(1)
-                original = self._mask_map.get(key)
-                if original:
-                    return original
-                return match.group(0)  # 无法还原则保留原样
-
-            result = re.sub(marker_pattern, restore_func, result)
+        def restore_func(match):
+            key = match.group(1)
+            original = self._mask_map.get(key)
+            if original:
+                self._mask_map.move_to_end(key)
+                return original
+            return match.group(0)  # 无法还原则保留原样
 
-        return result
+        return _MARKER_PATTERN.sub(restore_func, text)
 
     def clear_map(self):
         """清除映射表（每次请求后调用）"""
@@ -132,7 +148,9 @@ class PrivacyGuard:
 
     def has_sensitive(self, text: str) -> bool:
         """检查是否包含敏感信息"""
-        return len(self.detect_sensitive(text)) > 0
+        if not _CANDIDATE_PATTERN.search(text):
+            return False
+        return _COMBINED_PATTERN.search(text) is not None
 
 
 # 全局实例
@@ -4,10 +4,28 @@
 
 import logging
 import re
-from typing import List
+from functools import lru_cache
+from typing import List, Tuple
 
 logger = logging.getLogger(__name__)
 
+# 分词正则：\w 已覆盖中文字符，连续的 \w 串两端天然是词边界，无需再写 \b
+_WORD_RE = re.compile(r"\w+")
+
+# 文件名查询信号：结尾的扩展名、中文字符
+_EXTENSION_RE = re.compile(r"\.\w{2,5}$")
+_CJK_RE = re.compile("[\u4e00-\u9fff]")
+
+
+def _compile_synonym_pattern(key: str) -> "re.Pattern[str]":
+    """编译同义词键的匹配模式 - 使用词边界检测避免子串误替换"""
+    # 对于中文，使用前后不是中文字符的边界
+    if _CJK_RE.search(key):
+        # 包含中文字符，使用更宽松的匹配
+        return re.compile(re.escape(key))
+    # 纯英文/数字，使用词边界
+    return re.compile(r"\b" + re.escape(key) + r"\b")
+
 
 class QueryProcessor:
     """查询预处理器 - 扩展查询、同义词、纠错"""
@@ -168,6 +186,12 @@ class QueryProcessor:
         "禁用": ["关闭", "停用", "disable", "deactivate"],
     }
 
+    # 同义词匹配正则在类定义时编译一次，所有实例共享
+    _SYNONYM_PATTERNS = tuple(
+        (key, _compile_synonym_pattern(key), synonyms)
+        for key, synonyms in SYNONYMS.items()
+    )
+
     # 文件名变体模式
     FILENAME_VARIANTS = [
         "{query}说明",
@@ -229,6 +253,21 @@ class QueryProcessor:
         "{query}个性化",
     ]
 
+    # 文件类型关键词（文件名查询信号）
+    FILENAME_INDICATORS = (
+        "文件",
+        "文档",
+        "doc",
+        "file",
+        "pdf",
+        "word",
+        "excel",
+        "ppt",
+        "txt",
+        "md",
+        "文件名",
+    )
+
     # 文件名匹配停用词（更完整）
     FILENAME_STOPWORDS = frozenset(
         {
@@ -376,9 +415,13 @@ class QueryProcessor:
         }
     )
 
+    PROCESS_CACHE_SIZE = 1024  # 查询扩展结果缓存条目数
+
     def __init__(self, config_loader=None):
         self.config_loader = config_loader
         self.logger = logging.getLogger(__name__)
+        # 扩展结果只取决于查询字符串，按实例做 LRU 缓存，重复查询直接命中
+        self._expand_cached = lru_cache(maxsize=self.PROCESS_CACHE_SIZE)(self._expand)
 
     def process(self, query: str) -> List[str]:
         """
@@ -393,16 +436,19 @@ class QueryProcessor:
 
         优化：
         - 短查询（<=2字符）跳过扩展，直接返回原始查询，避免性能开销
+        - 扩展结果按查询缓存，每次返回新的列表，调用方可放心修改
         """
         if not query or not query.strip():
             return []
 
-        query = query.strip()
+        return list(self._expand_cached(query.strip()))
 
+    def _expand(self, query: str) -> Tuple[str, ...]:
+        """扩展已去除首尾空白的查询，返回不可变元组供缓存复用"""
         # 优化：短查询跳过所有扩展，避免性能开销
         if len(query) <= 2:
             self.logger.debug(f"短查询 '{query}' 跳过扩展")
-            return [query]
+            return (query,)
 
         queries = [query]  # 原始查询
 
@@ -423,7 +469,7 @@ class QueryProcessor:
         queries = self._clean_and_deduplicate(queries)
 
         self.logger.debug(f"查询扩展: '{query}' -> {queries}")
-        return queries
+        return tuple(queries)
 
     def _expand_abbreviations(self, query: str) -> List[str]:
         """展开常见缩写"""
@@ -435,7 +481,7 @@ class QueryProcessor:
             expanded.extend(self.ABBREVIATIONS[query_lower])
 
         # 检查查询中的每个词是否是缩写
-        words = re.findall(r"\b\w+\b", query_lower)
+        words = _WORD_RE.findall(query_lower)
         for word in words:
             if word in self.ABBREVIATIONS:
                 expanded.extend(self.ABBREVIATIONS[word])
@@ -448,15 +494,10 @@ class QueryProcessor:
         query_lower = query.lower()
 
         # 检查查询中的每个词是否有同义词
-        for key, synonyms in self.SYNONYMS.items():
-            # 使用词边界正则表达式匹配完整词
-            # 对于中文，使用前后不是中文字符的边界
-            if any("\u4e00" <= c <= "\u9fff" for c in key):
-                # 包含中文字符，使用更宽松的匹配
-                pattern = re.compile(re.escape(key))
-            else:
-                # 纯英文/数字，使用词边界
-                pattern = re.compile(r"\b" + re.escape(key) + r"\b")
+        for key, pattern, synonyms in self._SYNONYM_PATTERNS:
+            # 子串检查是词边界匹配的必要条件，绝大多数键在此处即被排除
+            if key not in query_lower:
+                continue
 
             if pattern.search(query_lower):
                 # 为每个同义词创建一个变体查询
@@ -471,23 +512,20 @@ class QueryProcessor:
 
     def _generate_filename_variants(self, query: str) -> List[str]:
         """生成文件名匹配变体"""
-        variants: list[str] = []
-
         # 清理查询，去除常见停用词
         cleaned_query = self._clean_query_for_filename(query)
         if not cleaned_query:
-            return variants
+            return []
 
         # 生成文件名变体，限制最大数量
-        for pattern in self.FILENAME_VARIANTS[: self.MAX_FILENAME_VARIANTS]:
-            variant = pattern.format(query=cleaned_query)
-            variants.append(variant)
-
-        return variants
+        return [
+            pattern.format(query=cleaned_query)
+            for pattern in self.FILENAME_VARIANTS[: self.MAX_FILENAME_VARIANTS]
+        ]
 
     def _clean_query_for_filename(self, query: str) -> str:
         """清理查询，去除停用词，适合用于文件名匹配"""
-        words = re.findall(r"\b\w+\b", query.lower())
+        words = _WORD_RE.findall(query.lower())
         cleaned_words = [
             w for w in words if w not in self.FILENAME_STOPWORDS and len(w) > 1
         ]
@@ -515,7 +553,7 @@ class QueryProcessor:
             return []
 
         # 分词
-        words = re.findall(r"\b\w+\b", query.lower())
+        words = _WORD_RE.findall(query.lower())
 
         # 过滤停用词和短词
         keywords = [w for w in words if w not in self.KEYWORD_STOPWORDS and len(w) > 1]
@@ -542,15 +580,15 @@ class QueryProcessor:
         query_lower = query.lower().strip()
 
         # 信号1: 包含路径符号
-        if re.search(r"[\/]", query):
+        if "/" in query:
             score += 40
 
         # 信号2: 包含文件扩展名 (.pdf, .docx 等)
-        if re.search(r"\.\w{2,5}$", query_lower):
+        if _EXTENSION_RE.search(query_lower):
             score += 30
 
         # 信号3: 不含空格的中文查询
-        if any("\u4e00" <= c <= "\u9fff" for c in query) and " " not in query:
+        if " " not in query and _CJK_RE.search(query):
             score += 20
 
         # 信号4: 长度 < 20字符
@@ -558,23 +596,8 @@ class QueryProcessor:
             score += 10
 
         # 信号5: 包含文件类型关键词
-        filename_indicators = [
-            "文件",
-            "文档",
-            "doc",
-            "file",
-            "pdf",
-            "word",
-            "excel",
-            "ppt",
-            "txt",
-            "md",
-            "文件名",
-        ]
-        for indicator in filename_indicators:
-            if indicator in query_lower:
-                score += 15
-                break
+        if any(indicator in query_lower for indicator in self.FILENAME_INDICATORS):
+            score += 15
 
         # 阈值判断
         return score >= 50
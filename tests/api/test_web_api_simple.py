@@ -2,12 +2,8 @@
 Web API 简单测试 - 不导入完整app
 """
 
-import sys
-from pathlib import Path
 from unittest.mock import Mock
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 
 class TestRateLimiter:
     """RateLimiter 测试类"""
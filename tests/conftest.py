@@ -13,13 +13,16 @@ import os
 import sys
 import threading
 import time
+from pathlib import Path
 from typing import Any, Callable, Dict, List
 from unittest.mock import MagicMock, Mock
 
 import pytest
 
-# 添加项目根目录到Python路径（只需在顶层 conftest.py 中添加一次）
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# 确保项目根目录位于 sys.path 首位且只出现一次（pyproject 的 pythonpath 已添加，
+# 这里兼容未读取该配置的运行方式）；各测试模块不再各自插入路径
+_PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path[:] = [_PROJECT_ROOT] + [p for p in sys.path if p != _PROJECT_ROOT]
 
 # CI 环境下 tantivy/hnswlib 的 Rust 编译库可能使用不可用的 CPU 指令集（如 AVX-512），
 # 导致 import 时发生 Illegal instruction 崩溃（Python 无法捕获）。
@@ -216,26 +219,42 @@ mock_rag = MockRAGPipelineFactory()
 mock_index = MockIndexManagerFactory()
 
 
-@pytest.fixture
-def temp_config(tmp_path):
-    """创建临时配置用于测试 - 使用 pytest 的 tmp_path fixture"""
-    # 使用 pytest 的 tmp_path 获取临时目录，更现代且自动清理
-    config = MockConfigFactory.create_config(
+def _build_temp_config(data_dir: Path):
+    """创建所有数据路径都位于 data_dir 下的临时配置"""
+    return MockConfigFactory.create_config(
         {
-            "system": {"data_dir": str(tmp_path)},
+            "system": {"data_dir": str(data_dir)},
             "index": {
-                "tantivy_path": str(tmp_path / "tantivy"),
-                "hnsw_path": str(tmp_path / "hnsw"),
-                "metadata_path": str(tmp_path / "metadata"),
+                "tantivy_path": str(data_dir / "tantivy"),
+                "hnsw_path": str(data_dir / "hnsw"),
+                "metadata_path": str(data_dir / "metadata"),
             },
-            "chat_history": {"db_path": str(tmp_path / "chat_history.db")},
+            "chat_history": {"db_path": str(data_dir / "chat_history.db")},
             "file_scanner": {
-                "scan_paths": [str(tmp_path / "documents")],
+                "scan_paths": [str(data_dir / "documents")],
                 "max_file_size": 100 * 1024 * 1024,
             },
         }
     )
-    yield config
+
+
+@pytest.fixture
+def temp_config(tmp_path):
+    """创建临时配置用于测试 - 使用 pytest 的 tmp_path fixture"""
+    # 使用 pytest 的 tmp_path 获取临时目录，更现代且自动清理
+    yield _build_temp_config(tmp_path)
+
+
+@pytest.fixture
+def temp_config_factory(tmp_path):
+    """按名称创建相互独立的临时配置，用于同一用例内需要多套全新索引的场景"""
+
+    def _create(name: str):
+        data_dir = tmp_path / name
+        data_dir.mkdir()
+        return _build_temp_config(data_dir)
+
+    return _create
 
 
 @pytest.fixture
@@ -12,6 +12,18 @@ import sys
 import time
 
 import pytest
+from playwright.sync_api import expect
+
+from tests.e2e.pages import SearchPage
+
+# expect 断言默认超时（毫秒）。页面已加载完成后的存在性检查无需默认的 5 秒，
+# 缩短后“元素不存在”分支更快返回；CI 较慢时可通过环境变量调大。
+# 需要等待后端请求的断言应显式传入更长的 timeout。
+EXPECT_TIMEOUT_MS = int(os.environ.get("PWTEST_DEFAULT_TIMEOUT", "2000"))
+expect.set_options(timeout=EXPECT_TIMEOUT_MS)
+
+# 测试只基于 DOM/CSS 定位器断言，图片和字体与结果无关，拦截后页面可更早加载完成
+_BLOCKED_ASSETS = "**/*.{png,jpg,jpeg,gif,webp,ico,svg,woff,woff2,ttf,otf}"
 
 
 def _get_dynamic_port():
@@ -32,6 +44,15 @@ def _get_dynamic_port():
     return 18642
 
 
+def _wait_for_app_ready(page):
+    """页面就绪门槛：DOM 解析完成且搜索输入框可见
+
+    不使用 networkidle —— 前端存在轮询请求，等待 500ms 网络静默既慢又不稳定。
+    """
+    page.wait_for_load_state("domcontentloaded")
+    expect(SearchPage(page).search_input).to_be_visible(timeout=5000)
+
+
 def _is_linux_display_available():
     """检查 Linux 是否有可用的显示环境"""
     if sys.platform != "linux":
@@ -92,13 +113,31 @@ def viewport_size():
     return {"width": 1280, "height": 720}
 
 
+def _claim_server_start(tmp_path_factory, worker_id) -> bool:
+    """判断当前进程是否负责在本地启动服务器
+
+    串行运行时总是由本进程启动；xdist 下每个 worker 都会执行 session 级 fixture，
+    只有第一个成功创建标记文件的 worker 启动服务器，其余 worker 仅等待就绪。
+    标记文件放在本次运行所有 worker 共享的临时目录中，不会残留到下次运行。
+    """
+    if worker_id == "master":
+        return True
+    marker = tmp_path_factory.getbasetemp().parent / "e2e_server_start.lock"
+    try:
+        os.close(os.open(marker, os.O_CREAT | os.O_EXCL))
+    except FileExistsError:
+        return False
+    return True
+
+
 @pytest.fixture(scope="session")
-def _ensure_server_running(base_url):
-    """确保测试服务器已启动（session级别，只执行一次）
+def _ensure_server_running(base_url, tmp_path_factory, worker_id):
+    """确保测试服务器已启动（session级别，每个进程只执行一次）
 
     如果服务器未运行：
     - 在 CI 环境中：等待 30 秒后超时（CI 应自行启动服务器）
-    - 在本地环境中：自动启动服务器进程
+    - 在本地环境中：自动启动服务器进程；xdist 并行时只由一个 worker 启动，
+      其余 worker 等待同一服务器就绪，避免多个进程抢占同一端口
     """
     import urllib.error
     import urllib.request
@@ -144,6 +183,13 @@ def _ensure_server_running(base_url):
         warnings.warn("[E2E] CI 环境中服务器未启动，测试可能失败")
         return False
 
+    # 本地环境：其他 worker 已负责启动时只等待
+    if not _claim_server_start(tmp_path_factory, worker_id):
+        print(f"\n[E2E] {worker_id}：等待其他 worker 启动的服务器...")
+        if wait_for_app_ready(base_url, timeout=60):
+            return True
+        pytest.exit("[E2E] 等待其他 worker 启动服务器超时（60秒）")
+
     # 本地环境：自动启动服务器
     print("\n[E2E] 本地环境：自动启动服务器...")
     server_process = None
@@ -189,6 +235,20 @@ def _ensure_server_running(base_url):
         pytest.exit(f"[E2E] 启动服务器失败: {e}")
 
 
+@pytest.fixture
+def page(page, base_url, _ensure_server_running):
+    """在 pytest-playwright 的逐用例 page 上打开首页并等待应用就绪
+
+    上下文和页面仍由 pytest-playwright 按用例创建，失败时的截图、录屏和 trace
+    （--screenshot/--video/--tracing）照常生成，用例之间也不共享存储、
+    Service Worker 或权限状态。图片和字体请求直接中止，不参与加载。
+    """
+    page.context.route(_BLOCKED_ASSETS, lambda route: route.abort())
+    page.goto(base_url)
+    _wait_for_app_ready(page)
+    return page
+
+
 @pytest.fixture(autouse=True)
 def _setup_test_environment(page, base_url, _ensure_server_running):
     """每个测试用例的通用设置 - 智能导航
@@ -210,10 +270,9 @@ def _setup_test_environment(page, base_url, _ensure_server_running):
 
 
 # pytest-playwright 提供的 fixtures (不需要重新定义):
-# - page: Playwright Page 对象
 # - browser: Playwright Browser 对象
-# - browser_context: Playwright BrowserContext 对象
 # - playwright: Playwright 对象
+# page 已在上方包装为打开首页并等待就绪的逐用例页面
 
 
 def pytest_configure(config):
@@ -234,7 +293,6 @@ def wait_for_app_ready(base_url: str, timeout: int = 30) -> bool:
     Returns:
         True 如果应用就绪，False 否则
     """
-    import time
     import urllib.error
     import urllib.request
 
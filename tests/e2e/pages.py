@@ -0,0 +1,174 @@
+"""E2E 页面对象 (Page Object)
+
+集中维护 UI 测试使用的选择器，定位器以惰性属性的形式创建并按实例缓存，
+同一测试内重复访问不会重新构造选择器；选择器调整时也只需修改此处。
+"""
+
+from functools import cached_property
+
+from playwright.sync_api import Locator, Page, expect
+
+# 设置模态框（Bootstrap 模态框必须带 show 类才算打开）
+SETTINGS_MODAL_OPEN = "#settingsModal.modal.show, #settingsModal.modal.fade.show"
+
+
+def click_if_present(locator: Locator, timeout: float = 500) -> bool:
+    """元素在 timeout 毫秒内可见则点击并返回 True，否则返回 False
+
+    与一次性的 is_visible() 判断不同，这里会短暂自动等待，
+    避免渲染稍慢时误判元素不存在而静默跳过断言。
+    """
+    try:
+        expect(locator).to_be_visible(timeout=timeout)
+    except AssertionError:
+        return False
+    locator.click()
+    return True
+
+
+class SearchPage:
+    """搜索页面"""
+
+    def __init__(self, page: Page):
+        self.page = page
+
+    @cached_property
+    def search_input(self) -> Locator:
+        return self.page.locator('input[type="text"]').first
+
+    @cached_property
+    def search_button(self) -> Locator:
+        return self.page.locator(
+            'button:has-text("搜索"), button:has-text("Search"), '
+            '.search-button, [data-testid="search-button"], .search-btn'
+        ).first
+
+    @cached_property
+    def search_icon(self) -> Locator:
+        return self.page.locator(
+            '.search-icon, [class*="search"], .search-input-box button, '
+            "#searchInput + button"
+        ).first
+
+    @cached_property
+    def results_container(self) -> Locator:
+        return self.page.locator("#resultsContainer, .search-results").first
+
+    @cached_property
+    def welcome(self) -> Locator:
+        return self.page.locator("#search-welcome-container, .search-welcome")
+
+    @cached_property
+    def result_items(self) -> Locator:
+        return self.page.locator('.result-item, [class*="result"], .file-item')
+
+    def search(self, query: str) -> None:
+        """输入关键词并回车提交"""
+        self.search_input.fill(query)
+        self.search_input.press("Enter")
+
+
+class SettingsPage:
+    """设置面板"""
+
+    def __init__(self, page: Page):
+        self.page = page
+
+    @cached_property
+    def settings_button(self) -> Locator:
+        return self.page.locator(
+            'button.settings-btn, button[aria-label="设置"], '
+            ".top-nav-bar button:last-child"
+        ).first
+
+    @cached_property
+    def fallback_settings_button(self) -> Locator:
+        return self.page.locator(".top-nav-bar button").last
+
+    @cached_property
+    def settings_panel(self) -> Locator:
+        return self.page.locator(SETTINGS_MODAL_OPEN).first
+
+    @cached_property
+    def close_button(self) -> Locator:
+        return self.page.locator(
+            'button:has-text("关闭"), button:has-text("Close"), '
+            'button:has-text("×"), .close-button, [data-testid="close"]'
+        ).first
+
+    @cached_property
+    def api_url_input(self) -> Locator:
+        return self.page.locator(
+            'input[name*="api_url"], input[name*="api-url"], input[placeholder*="URL"]'
+        ).first
+
+    @cached_property
+    def api_key_input(self) -> Locator:
+        return self.page.locator(
+            'input[type="password"], input[name*="api_key"], input[name*="api-key"]'
+        ).first
+
+    @cached_property
+    def temp_slider(self) -> Locator:
+        return self.page.locator(
+            'input[type="range"][name*="temperature"], '
+            'input[type="range"][name*="temp"]'
+        ).first
+
+    @cached_property
+    def max_tokens_input(self) -> Locator:
+        return self.page.locator(
+            'input[name*="max_tokens"], input[name*="max-tokens"], input[type="number"]'
+        ).first
+
+    @cached_property
+    def save_button(self) -> Locator:
+        return self.page.locator(
+            'button:has-text("保存"), button:has-text("Save"), '
+            '.save-button, [data-testid="save"]'
+        ).first
+
+    @cached_property
+    def reset_button(self) -> Locator:
+        return self.page.locator(
+            'button:has-text("重置"), button:has-text("Reset"), .reset-button'
+        ).first
+
+    @cached_property
+    def tabs(self) -> Locator:
+        return self.page.locator(
+            '#settingsModal .nav-pills button, #settingsModal [role="tab"]'
+        )
+
+    @cached_property
+    def add_directory_button(self) -> Locator:
+        return self.page.locator(
+            'button:has-text("添加目录"), button:has-text("Add Directory"), '
+            '.add-directory, [data-testid="add-directory"]'
+        ).first
+
+    def visible_tab_indices(self, limit: int = 3) -> list[int]:
+        """在浏览器端一次性筛选可见标签页，返回前 limit 个的下标"""
+        return self.tabs.evaluate_all(
+            "(els, limit) => els"
+            ".map((e, i) => (e.offsetParent !== null ? i : -1))"
+            ".filter((i) => i >= 0)"
+            ".slice(0, limit)",
+            limit,
+        )
+
+    def open(self) -> None:
+        """打开设置面板（page fixture 已处于加载完成的首页）"""
+        settings_button = self.settings_button
+
+        # 等待按钮可见
+        try:
+            settings_button.wait_for(state="visible", timeout=10000)
+        except Exception:
+            # 如果找不到，尝试其他选择器
+            settings_button = self.fallback_settings_button
+
+        if settings_button.is_visible():
+            settings_button.click()
+            # 等待设置模态框出现
+            self.settings_panel.wait_for(state="visible", timeout=10000)
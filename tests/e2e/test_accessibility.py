@@ -13,13 +13,7 @@
 - 图片 Alt 文本
 """
 
-import os
-import sys
-
 import pytest
-
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
-
 from playwright.sync_api import Page
 
 # WCAG 2.1 AA 标准颜色对比度要求
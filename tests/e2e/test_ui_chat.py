@@ -2,13 +2,8 @@
 聊天功能UI测试 - Playwright
 """
 
-import os
-import sys
-
 import pytest
 
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
-
 
 @pytest.mark.e2e
 class TestUIChat:
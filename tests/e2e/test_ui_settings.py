@@ -2,58 +2,32 @@
 设置面板UI测试 - Playwright
 """
 
-import os
-import sys
+import re
 
 import pytest
+from playwright.sync_api import expect
 
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from tests.e2e.pages import SettingsPage, click_if_present
 
 
 @pytest.mark.e2e
 class TestUISettings:
     """设置面板UI测试类"""
 
-    def open_settings(self, page):
-        """打开设置面板"""
-        # 导航到页面
-        page.goto("http://127.0.0.1:18642", timeout=30000)
-        page.wait_for_load_state("domcontentloaded")
-        page.wait_for_load_state("networkidle")
-
-        # 查找设置按钮 (使用更精确的选择器)
-        settings_button = page.locator(
-            'button.settings-btn, button[aria-label="设置"], '
-            ".top-nav-bar button:last-child"
-        ).first
-
-        # 等待按钮可见
-        try:
-            settings_button.wait_for(state="visible", timeout=10000)
-        except Exception:
-            # 如果找不到，尝试其他选择器
-            settings_button = page.locator(".top-nav-bar button").last
-
-        if settings_button.is_visible():
-            settings_button.click()
-            # 等待设置模态框出现 - 使用更精确的选择器
-            # 必须同时满足：是settingsModal 且 有show类
-            modal = page.locator(
-                "#settingsModal.modal.show, #settingsModal.modal.fade.show"
-            ).first
-            modal.wait_for(state="visible", timeout=10000)
+    @pytest.fixture
+    def settings(self, page):
+        """已打开的设置面板页面对象（需要面板的用例直接依赖此 fixture）"""
+        settings = SettingsPage(page)
+        settings.open()
+        return settings
 
-    def test_settings_panel_open(self, page):
+    def test_settings_panel_open(self, page, settings):
         """测试设置面板打开"""
-        self.open_settings(page)
-
         # 验证页面已加载
         assert page.url.startswith("http://127.0.0.1:18642"), "页面应正常加载"
 
         # 使用精确的选择器查找Bootstrap模态框（必须有show类）
-        settings_panel = page.locator(
-            "#settingsModal.modal.show, #settingsModal.modal.fade.show"
-        ).first
+        settings_panel = settings.settings_panel
 
         # 等待模态框动画完成并可见
         settings_panel.wait_for(state="visible", timeout=10000)
@@ -61,19 +35,12 @@ class TestUISettings:
         # 验证模态框确实可见
         assert settings_panel.is_visible(), "设置面板应该可见"
 
-    def test_settings_panel_close(self, page):
+    def test_settings_panel_close(self, page, settings):
         """测试设置面板关闭"""
-        self.open_settings(page)
-
         # 查找关闭按钮
-        close_selectors = (
-            'button:has-text("关闭"), button:has-text("Close"), '
-            'button:has-text("×"), .close-button, [data-testid="close"]'
-        )
-        close_button = page.locator(close_selectors).first
+        close_button = settings.close_button
 
-        if close_button.is_visible():
-            close_button.click()
+        if click_if_present(close_button):
             # 等待模态框关闭
             page.locator("#settingsModal, .modal.show").first.wait_for(
                 state="hidden", timeout=5000
@@ -81,10 +48,8 @@ class TestUISettings:
 
         assert page.url.startswith("http://127.0.0.1:18642")
 
-    def test_ai_model_settings(self, page):
+    def test_ai_model_settings(self, page, settings):
         """测试AI模型设置"""
-        self.open_settings(page)
-
         # 查找AI模型设置区域
         page.locator(
             '.ai-settings, [class*="ai-model"], [data-testid="ai-settings"]'
@@ -96,137 +61,99 @@ class TestUISettings:
         ).first
 
         if enable_checkbox.is_visible():
-            # 切换启用状态
+            # 切换启用状态，等待勾选状态实际翻转
+            was_checked = enable_checkbox.is_checked()
             enable_checkbox.click()
-            # NOTE: Removed fixed wait - Playwright auto-waits
+            expect(enable_checkbox).to_be_checked(checked=not was_checked)
 
         assert page.url.startswith("http://127.0.0.1:18642")
 
-    def test_api_url_input(self, page):
+    def test_api_url_input(self, page, settings):
         """测试API URL输入"""
-        self.open_settings(page)
-
         # 查找API URL输入框
-        api_url_input = page.locator(
-            'input[name*="api_url"], input[name*="api-url"], input[placeholder*="URL"]'
-        ).first
+        api_url_input = settings.api_url_input
 
         if api_url_input.is_visible():
             # 输入测试URL
             api_url_input.fill("http://localhost:8080/v1/chat/completions")
-            # NOTE: Removed fixed wait - Playwright auto-waits
 
-            # 验证输入值
-            value = api_url_input.input_value()
-            assert "localhost" in value
+            # 验证输入值（expect 自动重试直到满足条件）
+            expect(api_url_input).to_have_value(re.compile("localhost"))
 
-    def test_api_key_input(self, page):
+    def test_api_key_input(self, page, settings):
         """测试API密钥输入"""
-        self.open_settings(page)
-
         # 查找API密钥输入框
-        api_key_input = page.locator(
-            'input[type="password"], input[name*="api_key"], input[name*="api-key"]'
-        ).first
+        api_key_input = settings.api_key_input
 
         if api_key_input.is_visible():
             # 输入测试密钥
             api_key_input.fill("test-api-key-12345")
-            # NOTE: Removed fixed wait - Playwright auto-waits
 
             # 验证输入值（密码字段可能无法直接读取）
-            assert api_key_input.is_visible()
+            expect(api_key_input).to_be_visible()
 
-    def test_temperature_slider(self, page):
+    def test_temperature_slider(self, page, settings):
         """测试Temperature滑块"""
-        self.open_settings(page)
-
         # 查找temperature滑块
-        temp_slider = page.locator(
-            'input[type="range"][name*="temperature"], '
-            'input[type="range"][name*="temp"]'
-        ).first
+        temp_slider = settings.temp_slider
 
         if temp_slider.is_visible():
             # 设置值
             temp_slider.fill("0.7")
-            # NOTE: Removed fixed wait - Playwright auto-waits
 
             value = temp_slider.input_value()
             assert value is not None
 
-    def test_max_tokens_input(self, page):
+    def test_max_tokens_input(self, page, settings):
         """测试最大令牌数输入"""
-        self.open_settings(page)
-
         # 查找max tokens输入框
-        max_tokens_input = page.locator(
-            'input[name*="max_tokens"], input[name*="max-tokens"], input[type="number"]'
-        ).first
+        max_tokens_input = settings.max_tokens_input
 
         if max_tokens_input.is_visible():
             # 输入值
             max_tokens_input.fill("2048")
-            # NOTE: Removed fixed wait - Playwright auto-waits
 
-            value = max_tokens_input.input_value()
-            assert value == "2048" or value == "2048.0"
+            expect(max_tokens_input).to_have_value(re.compile(r"^2048(\.0)?$"))
 
-    def test_save_settings(self, page):
+    @pytest.mark.xdist_group("settings_write")
+    def test_save_settings(self, page, settings):
         """测试保存设置"""
-        self.open_settings(page)
-
         # 查找保存按钮
-        save_selectors = (
-            'button:has-text("保存"), button:has-text("Save"), '
-            '.save-button, [data-testid="save"]'
-        )
-        save_button = page.locator(save_selectors).first
+        save_button = settings.save_button
 
-        if save_button.is_visible():
-            save_button.click()
-            # NOTE: Use wait_for_load_state or element visibility
+        if click_if_present(save_button):
+            # 保存期间按钮被禁用，恢复可用即表示保存流程结束
+            expect(save_button).to_be_enabled(timeout=10000)
 
         assert page.url.startswith("http://127.0.0.1:18642")
 
-    def test_reset_settings(self, page):
+    @pytest.mark.xdist_group("settings_write")
+    def test_reset_settings(self, page, settings):
         """测试重置设置"""
-        self.open_settings(page)
-
         # 查找重置按钮
-        reset_button = page.locator(
-            'button:has-text("重置"), button:has-text("Reset"), .reset-button'
-        ).first
-
-        if reset_button.is_visible():
-            reset_button.click()
-            # NOTE: Use auto-wait or specific condition
+        reset_button = settings.reset_button
 
+        if click_if_present(reset_button):
             # 可能需要确认
             confirm_button = page.locator(
                 'button:has-text("确认"), button:has-text("Confirm"), .confirm'
             ).first
-            if confirm_button.is_visible():
-                confirm_button.click()
-                # NOTE: Use auto-wait or specific condition
+            if click_if_present(confirm_button):
+                expect(confirm_button).to_be_hidden()
 
         assert page.url.startswith("http://127.0.0.1:18642")
 
-    def test_model_provider_selection(self, page):
+    def test_model_provider_selection(self, page, settings):
         """测试模型提供商选择"""
-        self.open_settings(page)
-
         # 先切换到API模式标签（因为提供商选择只在API模式下可见）
         mode_tab = page.locator('#v-pills-mode-tab, button:has-text("接入模式")').first
-        if mode_tab.is_visible():
-            mode_tab.click()
-            # NOTE: Use auto-wait or specific condition
+        if click_if_present(mode_tab):
+            expect(mode_tab).to_have_class(re.compile(r"\bactive\b"))
 
         # 切换到API模式
         api_mode_radio = page.locator('#modeAPI, input[value="api"]').first
-        if api_mode_radio.is_visible():
-            api_mode_radio.click()
-            # NOTE: Use auto-wait or specific condition
+        if click_if_present(api_mode_radio):
+            expect(api_mode_radio).to_be_checked()
 
         # 查找提供商下拉菜单（使用正确的ID）
         provider_select = page.locator(
@@ -236,18 +163,14 @@ class TestUISettings:
         if provider_select.is_visible():
             # 选择一个选项
             provider_select.select_option("siliconflow")
-            # NOTE: Removed fixed wait - Playwright auto-waits
 
-            value = provider_select.input_value()
-            assert value is not None
+            expect(provider_select).to_have_value("siliconflow")
         else:
             # 如果提供商选择器不可见，可能是本地模式或其他原因，跳过此测试
             pytest.skip("API提供商选择器不可见")
 
-    def test_system_prompt_input(self, page):
+    def test_system_prompt_input(self, page, settings):
         """测试系统提示词输入"""
-        self.open_settings(page)
-
         # 查找系统提示词文本框
         system_prompt_selectors = (
             'textarea[name*="system_prompt"], textarea[name*="system-prompt"], '
@@ -259,55 +182,37 @@ class TestUISettings:
             # 输入测试提示词
             test_prompt = "You are a helpful assistant."
             system_prompt.fill(test_prompt)
-            # NOTE: Removed fixed wait - Playwright auto-waits
 
-            value = system_prompt.input_value()
-            assert test_prompt in value
+            expect(system_prompt).to_have_value(re.compile(re.escape(test_prompt)))
 
-    def test_settings_tabs(self, page):
+    def test_settings_tabs(self, page, settings):
         """测试设置标签页"""
-        self.open_settings(page)
-
-        # 查找设置模态框内的标签页（使用更精确的选择器）
-        # 只选择模态框内的 nav-pills 按钮
-        tabs = page.locator(
-            '#settingsModal .nav-pills button, #settingsModal [role="tab"]'
-        ).all()
-
-        if len(tabs) > 0:
-            # 点击每个标签页
-            for tab in tabs[:3]:  # 最多测试前3个
-                if tab.is_visible():
-                    tab.click()
-                    # 等待对应的内容面板显示
-                    # NOTE: Playwright auto-waits for actionability
+        # 一次往返筛出可见的标签页，最多测试前3个
+        for i in settings.visible_tab_indices(limit=3):
+            tab = settings.tabs.nth(i)
+            tab.click()
+            # 等待标签页切换为激活状态
+            expect(tab).to_have_class(re.compile(r"\bactive\b"))
 
         assert page.url.startswith("http://127.0.0.1:18642")
 
-    def test_directory_settings(self, page):
+    def test_directory_settings(self, page, settings):
         """测试目录设置"""
-        self.open_settings(page)
-
         # 查找目录列表
         page.locator('.directory-list, [class*="directory"]').first
 
         # 查找添加目录按钮
-        add_dir_selectors = (
-            'button:has-text("添加目录"), button:has-text("Add Directory"), '
-            ".add-directory"
-        )
-        add_dir_button = page.locator(add_dir_selectors).first
+        add_dir_button = settings.add_directory_button
 
-        if add_dir_button.is_visible():
-            add_dir_button.click()
-            # NOTE: Use auto-wait or specific condition
+        if click_if_present(add_dir_button):
+            expect(page.locator("#addDirectoryModal")).to_be_visible()
 
         assert page.url.startswith("http://127.0.0.1:18642")
 
-    def test_test_connection_button(self, page):
+    # 配置有未保存改动时，测试连接会先 POST /api/config 落盘
+    @pytest.mark.xdist_group("settings_write")
+    def test_test_connection_button(self, page, settings):
         """测试连接按钮"""
-        self.open_settings(page)
-
         # 查找测试连接按钮
         test_button_selectors = (
             'button:has-text("测试"), button:has-text("Test"), '
@@ -315,16 +220,15 @@ class TestUISettings:
         )
         test_button = page.locator(test_button_selectors).first
 
-        if test_button.is_visible():
-            test_button.click()
-            # NOTE: Use smart wait for async operations
+        if click_if_present(test_button):
+            # 测试期间按钮被禁用，后端请求超时为 15 秒
+            expect(test_button).to_be_enabled(timeout=20000)
 
         assert page.url.startswith("http://127.0.0.1:18642")
 
-    def test_settings_persistence(self, page):
+    @pytest.mark.xdist_group("settings_write")
+    def test_settings_persistence(self, page, settings):
         """测试设置持久化"""
-        self.open_settings(page)
-
         # 修改一个设置
         api_url_input = page.locator(
             'input[name*="api_url"], input[name*="api-url"]'
@@ -333,22 +237,16 @@ class TestUISettings:
         if api_url_input.is_visible():
             test_url = "http://example.com/api"
             api_url_input.fill(test_url)
-            # NOTE: Removed fixed wait - Playwright auto-waits
 
             # 保存设置
-            save_button = page.locator(
-                'button:has-text("保存"), button:has-text("Save"), .save-button'
-            ).first
-            if save_button.is_visible():
-                save_button.click()
-                # NOTE: Use wait_for_load_state or element visibility
+            save_button = settings.save_button
+            if click_if_present(save_button):
+                expect(save_button).to_be_enabled(timeout=10000)
 
         assert page.url.startswith("http://127.0.0.1:18642")
 
-    def test_advanced_settings_toggle(self, page):
+    def test_advanced_settings_toggle(self, page, settings):
         """测试高级设置切换"""
-        self.open_settings(page)
-
         # 查找高级设置切换
         advanced_selectors = (
             'button:has-text("高级"), button:has-text("Advanced"), '
@@ -356,37 +254,30 @@ class TestUISettings:
         )
         advanced_toggle = page.locator(advanced_selectors).first
 
-        if advanced_toggle.is_visible():
-            advanced_toggle.click()
-            # NOTE: Use auto-wait or specific condition
-
+        if click_if_present(advanced_toggle):
             # 高级设置应该显示
-            page.locator('.advanced-settings, [class*="advanced"]').first
+            expect(
+                page.locator('.advanced-settings, [class*="advanced"]').first
+            ).to_be_visible()
 
         assert page.url.startswith("http://127.0.0.1:18642")
 
-    def test_add_directory_modal(self, page):
+    def test_add_directory_modal(self, page, settings):
         """测试添加目录模态框"""
-        self.open_settings(page)
-
         # 查找添加目录按钮
-        add_dir_button = page.locator(
-            'button:has-text("添加目录"), button:has-text("Add Directory"), '
-            '.add-directory, [data-testid="add-directory"]'
-        ).first
+        add_dir_button = settings.add_directory_button
 
         if not add_dir_button.is_visible():
             pytest.skip("添加目录按钮不可见")
 
         # 点击添加目录按钮
         add_dir_button.click()
-        # NOTE: Use auto-wait or specific condition
 
         # 验证模态框打开 - 检查模态框元素
         modal = page.locator(
             '#addDirectoryModal, .modal.add-directory, [role="dialog"]'
         )
-        assert modal.count() > 0, "添加目录模态框未打开"
+        expect(modal.first).to_be_attached()
 
         # 检查模态框内的关键元素
         path_input = page.locator('#addDirectoryPathInput, input[type="text"]')
@@ -402,21 +293,17 @@ class TestUISettings:
             cancel_btn = page.locator(
                 'button:has-text("取消"), button:has-text("Cancel")'
             )
-            if cancel_btn.count() > 0 and cancel_btn.first.is_visible():
-                cancel_btn.first.click()
-                # NOTE: Removed fixed wait - Playwright auto-waits
+            if click_if_present(cancel_btn.first):
+                expect(page.locator("#addDirectoryModal")).to_be_hidden()
 
-    def test_delete_directory_modal(self, page):
+    def test_delete_directory_modal(self, page, settings):
         """测试删除目录模态框"""
-        self.open_settings(page)
-
         # 先切换到目录管理标签
         dir_tab = page.locator(
             '#v-pills-directories-tab, button:has-text("目录管理")'
         ).first
-        if dir_tab.is_visible():
-            dir_tab.click()
-            # NOTE: Use auto-wait or specific condition
+        if click_if_present(dir_tab):
+            expect(dir_tab).to_have_class(re.compile(r"\bactive\b"))
 
         # 检查是否有目录存在
         empty_state = page.locator(".directory-empty").first
@@ -435,11 +322,10 @@ class TestUISettings:
 
         # 点击第一个删除按钮
         delete_buttons.first.click()
-        # NOTE: Use auto-wait or specific condition
 
         # 验证确认删除模态框打开
         modal = page.locator("#deleteDirectoryModal")
-        assert modal.count() > 0, "删除目录确认模态框未打开"
+        expect(modal).to_be_visible()
 
         # 检查确认按钮
         confirm_delete = page.locator("#confirmDirectoryDeleteBtn")
@@ -451,16 +337,11 @@ class TestUISettings:
 
         if confirm_delete.count() > 0 or cancel_delete.count() > 0:
             # 点击取消关闭模态框
-            if cancel_delete.count() > 0 and cancel_delete.first.is_visible():
-                cancel_delete.first.click()
-                # NOTE: Removed fixed wait - Playwright auto-waits
+            if click_if_present(cancel_delete.first):
+                expect(modal).to_be_hidden()
 
     def test_rebuild_index_modal(self, page):
         """测试重建索引模态框"""
-        # 访问首页（不打开设置）
-        page.goto("http://127.0.0.1:18642", timeout=30000)
-        page.wait_for_load_state("networkidle")
-
         # 查找重建索引按钮（在搜索侧边栏）
         rebuild_button = page.locator(
             ".sidebar .rebuild-btn, #sidebar-search-content .rebuild-btn, .rebuild-btn"
@@ -471,14 +352,12 @@ class TestUISettings:
 
         # 点击重建索引按钮（使用 JavaScript 点击避免被遮挡）
         rebuild_button.scroll_into_view_if_needed()
-        # NOTE: Use auto-wait or specific condition
         # 尝试直接点击，如果失败则使用 JS 点击
         try:
             rebuild_button.click(timeout=5000)
         except Exception:
             # 使用 JavaScript 点击
             rebuild_button.evaluate("el => el.click()")
-        # NOTE: Use auto-wait or specific condition
 
         # 验证模态框打开
         modal = page.locator("#rebuildIndexModal")
@@ -489,8 +368,8 @@ class TestUISettings:
             "#rebuildIndexModal.modal.show, #rebuildIndexModal.modal.fade.show"
         ).first
 
-        # 验证模态框可见（使用更可靠的方法）
-        assert modal_visible.is_visible(), "重建索引模态框应该可见"
+        # 验证模态框可见（等待 Bootstrap 动画添加 show 类）
+        expect(modal_visible).to_be_visible()
 
         # 关闭模态框
         rebuild_cancel_selectors = (
@@ -498,8 +377,6 @@ class TestUISettings:
             '#rebuildIndexModal button[data-bs-dismiss="modal"]'
         )
         cancel_button = page.locator(rebuild_cancel_selectors).first
-        if cancel_button.is_visible():
-            cancel_button.click()
-        else:
+        if not click_if_present(cancel_button):
             page.keyboard.press("Escape")
-        # NOTE: Removed fixed wait - Playwright auto-waits
+        expect(modal_visible).to_be_hidden()
@@ -1,17 +1,106 @@
 """测试数据工厂 - 用于生成测试数据"""
 
-import os
+import copy
 import random
-import sys
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+import time
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 from unittest.mock import Mock
 
-# 添加项目根目录到Python路径
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import numpy as np
 
 from backend.utils.config_loader import ConfigLoader
 
+# =============================================================================
+# 常量
+# =============================================================================
+
+# 文档内容词表
+_VOCAB = (
+    "Python",
+    "programming",
+    "code",
+    "development",
+    "software",
+    "data",
+    "analysis",
+    "machine",
+    "learning",
+    "artificial",
+    "intelligence",
+    "neural",
+    "network",
+    "algorithm",
+    "function",
+    "class",
+    "object",
+    "method",
+    "variable",
+    "constant",
+    "test",
+    "example",
+    "sample",
+    "document",
+    "file",
+    "search",
+    "index",
+    "query",
+    "result",
+    "database",
+)
+
+# 词表中每个词的 UTF-8 字节长度，批量生成时据此累加文档大小，无需逐篇编码
+_VOCAB_UTF8_LEN = np.array([len(word.encode("utf-8")) for word in _VOCAB])
+
+# 消息内容候选（用户提问 / 助手回答）
+_QUESTIONS = (
+    "What is Python?",
+    "How do I search for files?",
+    "Tell me about machine learning.",
+    "What documents do I have?",
+    "Search for code examples.",
+    "Find my notes about AI.",
+)
+
+_ANSWERS = (
+    "Python is a programming language.",
+    "You can search using the search bar.",
+    "Machine learning is a subset of AI.",
+    "Here are your documents...",
+    "I found these code examples...",
+    "Here are your AI notes...",
+)
+
+# ConfigFactory 的规范配置（只读视图见 _freeze）
+_MINIMAL_CONFIG = {
+    "system": {"data_dir": "./data"},
+    "search": {"max_results": 10},
+    "embedding": {"enabled": False},
+}
+
+_FULL_CONFIG = {
+    "system": {"data_dir": "./data", "log_level": "INFO"},
+    "search": {
+        "text_weight": 0.6,
+        "vector_weight": 0.4,
+        "max_results": 20,
+        "min_score": 0.3,
+    },
+    "embedding": {
+        "enabled": True,
+        "provider": "fastembed",
+        "model": "bge-small-zh",
+    },
+    "ai_model": {
+        "enabled": True,
+        "interface_type": "api",
+        "api_url": "http://localhost:8080/v1/chat/completions",
+        "context_size": 4096,
+    },
+    "file_scanner": {"scan_paths": ["./documents"], "batch_size": 100},
+    "monitor": {"enabled": True},
+}
+
 # =============================================================================
 # 辅助函数
 # =============================================================================
@@ -42,6 +131,19 @@ def bool_or_default(value: Any, default: bool = False) -> bool:
     return default
 
 
+def _freeze(value: Any) -> Any:
+    """递归转换为只读结构：dict -> MappingProxyType，list -> tuple"""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+_MINIMAL_CONFIG_VIEW = _freeze(_MINIMAL_CONFIG)
+_FULL_CONFIG_VIEW = _freeze(_FULL_CONFIG)
+
+
 class DocumentFactory:
     """文档数据工厂"""
 
@@ -86,7 +188,7 @@ class DocumentFactory:
             size = len(content.encode("utf-8"))
 
         if modified is None:
-            modified = datetime.now().timestamp()
+            modified = time.time()
 
         doc = {
             "path": path,
@@ -101,7 +203,10 @@ class DocumentFactory:
 
     @staticmethod
     def create_batch(
-        count: int, file_types: Optional[List[str]] = None, base_path: str = "/test"
+        count: int,
+        file_types: Optional[List[str]] = None,
+        base_path: str = "/test",
+        seed: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
         """
         批量创建文档数据
@@ -110,6 +215,7 @@ class DocumentFactory:
             count: 数量
             file_types: 文件类型列表
             base_path: 基础路径
+            seed: 随机种子，相同种子生成相同内容
 
         Returns:
             文档数据列表
@@ -117,54 +223,70 @@ class DocumentFactory:
         if file_types is None:
             file_types = ["txt", "pdf", "doc", "docx", "md"]
 
+        rng = np.random.default_rng(seed)
+
+        # 一次性采样所有随机数据
+        chosen_types = [
+            file_types[i] for i in rng.integers(len(file_types), size=count)
+        ]
+        word_counts = rng.integers(10, 101, size=count)
+        contents, sizes = DocumentFactory._generate_content_batch(word_counts, rng)
+        modified = time.time()
+
         documents = []
-        for i in range(count):
-            file_type = random.choice(file_types)
+        for i, (file_type, content, size) in enumerate(
+            zip(chosen_types, contents, sizes.tolist())
+        ):
             filename = f"doc_{i}.{file_type}"
             doc = DocumentFactory.create(
-                path=f"{base_path}/{filename}", filename=filename, file_type=file_type
+                path=f"{base_path}/{filename}",
+                filename=filename,
+                content=content,
+                file_type=file_type,
+                size=size,
+                modified=modified,
             )
             documents.append(doc)
 
         return documents
 
+    @staticmethod
+    def _generate_content_batch(
+        counts: np.ndarray, rng: np.random.Generator
+    ) -> Tuple[List[str], np.ndarray]:
+        """
+        批量生成随机内容
+
+        所有词下标一次性采样，按 counts 切分后拼接；文档大小由词表字节长度
+        分段求和得到，无需逐篇编码。
+
+        Args:
+            counts: 每篇文档的词数（均需大于 0）
+            rng: NumPy 随机数生成器
+
+        Returns:
+            (内容列表, 对应的 UTF-8 字节大小数组)
+        """
+        if len(counts) == 0:
+            return [], np.zeros(0, dtype=int)
+
+        idxs = rng.integers(len(_VOCAB), size=int(counts.sum()))
+        words = [_VOCAB[i] for i in idxs.tolist()]
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+        contents = [
+            " ".join(words[start : start + n])
+            for start, n in zip(starts.tolist(), counts.tolist())
+        ]
+        # 词字节数之和 + (n - 1) 个空格
+        sizes = np.add.reduceat(_VOCAB_UTF8_LEN[idxs], starts) + counts - 1
+        return contents, sizes
+
     @staticmethod
     def _generate_content(min_words: int = 10, max_words: int = 100) -> str:
         """生成随机内容"""
         word_count = random.randint(min_words, max_words)
-        words = [
-            "Python",
-            "programming",
-            "code",
-            "development",
-            "software",
-            "data",
-            "analysis",
-            "machine",
-            "learning",
-            "artificial",
-            "intelligence",
-            "neural",
-            "network",
-            "algorithm",
-            "function",
-            "class",
-            "object",
-            "method",
-            "variable",
-            "constant",
-            "test",
-            "example",
-            "sample",
-            "document",
-            "file",
-            "search",
-            "index",
-            "query",
-            "result",
-            "database",
-        ]
-        return " ".join(random.choices(words, k=word_count))
+        return " ".join(random.choices(_VOCAB, k=word_count))
 
 
 class SessionFactory:
@@ -199,12 +321,13 @@ class SessionFactory:
         if name is None:
             name = f"Session {random.randint(1, 100)}"
 
-        now = datetime.now()
-        if created_at is None:
-            created_at = now.timestamp()
-
-        if updated_at is None:
-            updated_at = (now + timedelta(minutes=random.randint(1, 60))).timestamp()
+        if created_at is None or updated_at is None:
+            now = time.time()
+            if created_at is None:
+                created_at = now
+            if updated_at is None:
+                # 1-60 分钟后更新
+                updated_at = now + random.randint(60, 3600)
 
         session = {
             "session_id": session_id,
@@ -217,10 +340,18 @@ class SessionFactory:
         return session
 
     @staticmethod
-    def create_batch(count: int) -> List[Dict[str, Any]]:
-        """批量创建会话数据"""
+    def create_batch(count: int, seed: Optional[int] = None) -> List[Dict[str, Any]]:
+        """批量创建会话数据（整批共用一个创建时间，seed 相同则随机字段相同）"""
+        rng = random.Random(seed)
+        now = time.time()
         return [
-            SessionFactory.create(message_count=random.randint(0, 50))
+            SessionFactory.create(
+                session_id=f"sess_{rng.randint(10000, 99999)}",
+                name=f"Session {rng.randint(1, 100)}",
+                created_at=now,
+                updated_at=now + 60 * rng.randint(1, 60),
+                message_count=rng.randint(0, 50),
+            )
             for _ in range(count)
         ]
 
@@ -251,7 +382,7 @@ class MessageFactory:
             content = MessageFactory._generate_content(role)
 
         if timestamp is None:
-            timestamp = datetime.now().timestamp()
+            timestamp = time.time()
 
         message = {
             "role": role,
@@ -293,29 +424,60 @@ class MessageFactory:
 
         return messages
 
+    @staticmethod
+    def create_conversations(
+        n_convs: int, turns: int = 3, seed: Optional[int] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        批量创建随机内容的对话（压测场景）
+
+        时间戳只取一次，问答内容各用一次 random.choices 预先采样，
+        避免逐条消息调用 create。
+
+        Args:
+            n_convs: 对话数量
+            turns: 每个对话的轮数
+            seed: 随机种子
+
+        Returns:
+            对话列表，每个对话为按 user/assistant 交替排列的消息列表；
+            同一对话的消息带相同的 session_id（conv_0、conv_1 ...）
+        """
+        rng = random.Random(seed)
+        total = n_convs * turns
+        timestamp = time.time()
+        questions = rng.choices(_QUESTIONS, k=total)
+        answers = rng.choices(_ANSWERS, k=total)
+
+        return [
+            [
+                message
+                for q, a in zip(
+                    questions[c * turns : (c + 1) * turns],
+                    answers[c * turns : (c + 1) * turns],
+                )
+                for message in (
+                    {
+                        "role": "user",
+                        "content": q,
+                        "timestamp": timestamp,
+                        "session_id": f"conv_{c}",
+                    },
+                    {
+                        "role": "assistant",
+                        "content": a,
+                        "timestamp": timestamp,
+                        "session_id": f"conv_{c}",
+                    },
+                )
+            ]
+            for c in range(n_convs)
+        ]
+
     @staticmethod
     def _generate_content(role: str) -> str:
         """生成随机消息内容"""
-        if role == "user":
-            questions = [
-                "What is Python?",
-                "How do I search for files?",
-                "Tell me about machine learning.",
-                "What documents do I have?",
-                "Search for code examples.",
-                "Find my notes about AI.",
-            ]
-            return random.choice(questions)
-        else:
-            answers = [
-                "Python is a programming language.",
-                "You can search using the search bar.",
-                "Machine learning is a subset of AI.",
-                "Here are your documents...",
-                "I found these code examples...",
-                "Here are your AI notes...",
-            ]
-            return random.choice(answers)
+        return random.choice(_QUESTIONS if role == "user" else _ANSWERS)
 
 
 class SearchResultFactory:
@@ -377,7 +539,10 @@ class SearchResultFactory:
 
     @staticmethod
     def create_batch(
-        count: int, min_score: float = 0.5, max_score: float = 1.0
+        count: int,
+        min_score: float = 0.5,
+        max_score: float = 1.0,
+        seed: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
         """
         批量创建搜索结果
@@ -386,58 +551,58 @@ class SearchResultFactory:
             count: 数量
             min_score: 最小分数
             max_score: 最大分数
+            seed: 随机种子
 
         Returns:
             搜索结果列表
         """
-        results = []
-        for i in range(count):
-            score = round(random.uniform(min_score, max_score), 2)
-            result = SearchResultFactory.create(filename=f"result_{i}.txt", score=score)
-            results.append(result)
+        rng = np.random.default_rng(seed)
+        scores = np.round(rng.uniform(min_score, max_score, size=count), 2)
 
-        # 按分数排序
-        results.sort(key=lambda x: x["score"], reverse=True)
-        return results
+        # 按分数降序排列（稳定排序，同分保持生成顺序）
+        order = np.argsort(-scores, kind="stable")
+        return [
+            SearchResultFactory.create(
+                filename=f"result_{i}.txt", score=float(scores[i])
+            )
+            for i in order.tolist()
+        ]
 
 
 class ConfigFactory:
     """配置数据工厂"""
 
     @staticmethod
-    def create_minimal() -> Dict[str, Any]:
-        """创建最小配置"""
-        return {
-            "system": {"data_dir": "./data"},
-            "search": {"max_results": 10},
-            "embedding": {"enabled": False},
-        }
+    def create_minimal(read_only: bool = False) -> Mapping[str, Any]:
+        """
+        创建最小配置
+
+        Args:
+            read_only: 为 True 时返回共享的只读视图（免去深拷贝）；
+                默认返回可自由修改的新字典
+
+        Returns:
+            配置数据
+        """
+        if read_only:
+            return _MINIMAL_CONFIG_VIEW
+        return copy.deepcopy(_MINIMAL_CONFIG)
 
     @staticmethod
-    def create_full() -> Dict[str, Any]:
-        """创建完整配置"""
-        return {
-            "system": {"data_dir": "./data", "log_level": "INFO"},
-            "search": {
-                "text_weight": 0.6,
-                "vector_weight": 0.4,
-                "max_results": 20,
-                "min_score": 0.3,
-            },
-            "embedding": {
-                "enabled": True,
-                "provider": "fastembed",
-                "model": "bge-small-zh",
-            },
-            "ai_model": {
-                "enabled": True,
-                "interface_type": "api",
-                "api_url": "http://localhost:8080/v1/chat/completions",
-                "context_size": 4096,
-            },
-            "file_scanner": {"scan_paths": ["./documents"], "batch_size": 100},
-            "monitor": {"enabled": True},
-        }
+    def create_full(read_only: bool = False) -> Mapping[str, Any]:
+        """
+        创建完整配置
+
+        Args:
+            read_only: 为 True 时返回共享的只读视图（免去深拷贝）；
+                默认返回可自由修改的新字典
+
+        Returns:
+            配置数据
+        """
+        if read_only:
+            return _FULL_CONFIG_VIEW
+        return copy.deepcopy(_FULL_CONFIG)
 
 
 class MockConfigFactory:
@@ -672,3 +837,29 @@ class MockConfigFactory:
             }
         }
         return cls.create_config(config)
+
+
+class FakeConfig:
+    """轻量只读配置桩，getter 签名与 ConfigLoader 一致
+
+    不记录调用、不拦截属性访问，适合只读取配置而不断言调用的测试；
+    需要 assert_called_* 或 set/save 行为时使用 MockConfigFactory。
+    """
+
+    def __init__(self, data: Optional[Mapping[str, Mapping[str, Any]]] = None):
+        self._data = data or {}
+
+    def get(self, section: str, key: str = None, default: Any = None) -> Any:
+        section_data = self._data.get(section, {})
+        if key is None:
+            return section_data or (default or {})
+        return section_data.get(key, default)
+
+    def getint(self, section: str, key: str, default: int = 0) -> int:
+        return int_or_default(self.get(section, key, default), default)
+
+    def getfloat(self, section: str, key: str, default: float = 0.0) -> float:
+        return float_or_default(self.get(section, key, default), default)
+
+    def getboolean(self, section: str, key: str, default: bool = False) -> bool:
+        return bool_or_default(self.get(section, key, default), default)
@@ -9,18 +9,25 @@
 """
 
 import os
+import statistics
+import sys
 import time
-from pathlib import Path
+from itertools import islice
+from typing import Optional
 
-import numpy as np
-import psutil
 import pytest
 
+try:
+    import resource
+except ImportError:  # Windows 无 resource 模块
+    resource = None
+
 from backend.core.index_manager import IndexManager
 from backend.core.search_engine import SearchEngine
 
 # 测试查询列表
 TEST_QUERIES = ["测试内容", "关键条款", "文档总结"]
+WARMUP_QUERY = "预热查询"
 
 # 性能基准阈值 - 企业标准
 PERFORMANCE_THRESHOLDS = {
@@ -32,6 +39,22 @@ PERFORMANCE_THRESHOLDS = {
 }
 
 
+def _peak_rss_mb() -> float:
+    """当前进程的峰值常驻内存（MB）
+
+    类 Unix 平台直接读取 getrusage 的 ru_maxrss（Linux 单位为 KiB，macOS 为字节），
+    只有 Windows 才回退到 psutil。
+    """
+    if resource is None:
+        import psutil
+
+        return psutil.Process().memory_info().peak_wset / 1024**2
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return max_rss / 1024**2
+    return max_rss / 1024
+
+
 class PerformanceBenchmark:
     """性能基准测试类"""
 
@@ -41,30 +64,42 @@ class PerformanceBenchmark:
         self.indexer = IndexManager(config)
         self.search_engine = SearchEngine(self.indexer, config)
 
-    def benchmark_indexing(self, test_dir: str) -> dict:
-        """基准测试索引性能"""
-        process = psutil.Process()
-        files = list(Path(test_dir).glob("*.txt"))
+    def benchmark_indexing(self, test_dir: str, limit: Optional[int] = None) -> dict:
+        """基准测试索引性能
+
+        Args:
+            test_dir: 测试数据目录
+            limit: 最多索引的文件数，None 表示全部
+        """
+        # os.scandir 直接给出 str 路径和文件名，不必为每个文件构造 Path 对象
+        with os.scandir(test_dir) as it:
+            files = list(islice((e for e in it if e.name.endswith(".txt")), limit))
         num_files = len(files)
 
         if num_files == 0:
             return {"error": "No test files found"}
 
-        # 索引时间
+        # 索引时间（含读取文件），文档攒齐后一次性交给批量接口，只获取一次索引锁
         start = time.monotonic()
+        documents = []
         for file in files:
-            doc_content = file.read_text()
-            document = {
-                "path": str(file),
-                "filename": file.name,
-                "content": doc_content,
-                "file_type": "text",
-                "size": file.stat().st_size,
-                "created": None,
-                "modified": None,
-                "keywords": "",
-            }
-            self.indexer.add_document(document)
+            # 测试数据均为 UTF-8，按字节读取后显式解码，跳过 read_text 的编码探测
+            with open(file.path, "rb") as f:
+                doc_content = f.read().decode("utf-8", "replace")
+            st = file.stat()
+            documents.append(
+                {
+                    "path": file.path,
+                    "filename": file.name,
+                    "content": doc_content,
+                    "file_type": "text",
+                    "size": st.st_size,
+                    "created": None,
+                    "modified": int(st.st_mtime),
+                    "keywords": "",
+                }
+            )
+        self.indexer.batch_add_documents(documents)
         index_time = time.monotonic() - start
 
         # 计算吞吐量
@@ -75,13 +110,17 @@ class PerformanceBenchmark:
             "total_index_time": index_time,
             "avg_index_time_per_doc": index_time / num_files if num_files > 0 else 0,
             "throughput_docs_per_sec": throughput,
-            "memory_mb": process.memory_info().rss / 1024**2,
+            "memory_mb": _peak_rss_mb(),
         }
 
     def benchmark_query(self, num_runs: int = 10) -> dict:
         """基准测试查询性能"""
         query_times = []
 
+        # 预热：首次查询需要打开 searcher、加载分词词典等一次性开销，不计入统计。
+        # 使用不在 TEST_QUERIES 中的查询，避免预热结果进入搜索缓存
+        self.search_engine.search(WARMUP_QUERY)
+
         for _ in range(num_runs):
             for query in TEST_QUERIES:
                 start = time.monotonic()
@@ -89,19 +128,21 @@ class PerformanceBenchmark:
                 elapsed = time.monotonic() - start
                 query_times.append(elapsed)
 
+        # 样本只有几十个，用标准库计算即可；inclusive 分位与 numpy 默认的线性插值一致
+        percentiles = statistics.quantiles(query_times, n=100, method="inclusive")
         return {
             "num_queries": len(query_times),
-            "avg_query_time": np.mean(query_times),
-            "p50_query_time": np.percentile(query_times, 50),
-            "p95_query_time": np.percentile(query_times, 95),
-            "p99_query_time": np.percentile(query_times, 99),
-            "min_query_time": np.min(query_times),
-            "max_query_time": np.max(query_times),
+            "avg_query_time": statistics.fmean(query_times),
+            "p50_query_time": percentiles[49],
+            "p95_query_time": percentiles[94],
+            "p99_query_time": percentiles[98],
+            "min_query_time": min(query_times),
+            "max_query_time": max(query_times),
         }
 
-    def run_full_benchmark(self, test_dir: str) -> dict:
+    def run_full_benchmark(self, test_dir: str, limit: Optional[int] = None) -> dict:
         """运行完整基准测试"""
-        index_results = self.benchmark_indexing(test_dir)
+        index_results = self.benchmark_indexing(test_dir, limit)
         query_results = self.benchmark_query()
 
         return {
@@ -165,44 +206,60 @@ def test_performance_memory_usage(generate_test_data, temp_config):
     )
 
 
-@pytest.mark.performance
-@pytest.mark.skipif(
+# 可扩展性测试的数据规模
+SCALABILITY_SCALES = [10, 50]
+
+_skip_in_ci = pytest.mark.skipif(
     os.environ.get("CI") == "true", reason="Skipped in CI due to resource constraints"
 )
-def test_performance_scalability(generate_test_data, temp_config):
-    """测试可扩展性：不同规模下的性能表现"""
+
+
+@pytest.mark.performance
+@_skip_in_ci
+@pytest.mark.parametrize("scale", SCALABILITY_SCALES)
+def test_performance_scalability(scale, generate_test_data, temp_config):
+    """测试可扩展性：各规模下的性能约束
+
+    每个规模使用独立的索引和搜索缓存，互不影响，可由 pytest-xdist 并行调度。
+    """
     benchmark = PerformanceBenchmark(temp_config)
+    test_dir = generate_test_data(scale)
+    results = benchmark.run_full_benchmark(test_dir)
 
-    scales = [10, 50]
-    scale_results = {}
+    # 断言性能约束 - 调整阈值以适应测试环境
+    avg_query_time = results["query"]["avg_query_time"]
+    index_time = results["indexing"]["total_index_time"]
+    memory_mb = results["indexing"]["memory_mb"]
 
-    for scale in scales:
-        test_dir = generate_test_data(scale)
-        results = benchmark.run_full_benchmark(test_dir)
-        scale_results[scale] = results
+    assert avg_query_time < PERFORMANCE_THRESHOLDS["query_time_avg"], (
+        f"规模 {scale}: 平均查询时间 {avg_query_time:.3f}s 超过阈值"
+    )
+    assert index_time < 300, f"规模 {scale}: 索引时间 {index_time:.2f}s 超过 300s 限制"
+    assert memory_mb < PERFORMANCE_THRESHOLDS["memory_max_mb"], (
+        f"规模 {scale}: 内存使用 {memory_mb:.2f}MB 超过阈值"
+    )
 
-        # 断言性能约束 - 调整阈值以适应测试环境
-        avg_query_time = results["query"]["avg_query_time"]
-        index_time = results["indexing"]["total_index_time"]
-        memory_mb = results["indexing"]["memory_mb"]
 
-        assert avg_query_time < PERFORMANCE_THRESHOLDS["query_time_avg"], (
-            f"规模 {scale}: 平均查询时间 {avg_query_time:.3f}s 超过阈值"
-        )
-        assert index_time < 300, (
-            f"规模 {scale}: 索引时间 {index_time:.2f}s 超过 300s 限制"
-        )
-        assert memory_mb < PERFORMANCE_THRESHOLDS["memory_max_mb"], (
-            f"规模 {scale}: 内存使用 {memory_mb:.2f}MB 超过阈值"
-        )
+@pytest.mark.performance
+@_skip_in_ci
+def test_performance_indexing_sublinear(generate_test_data, temp_config_factory):
+    """测试可扩展性：索引时间应随规模线性或亚线性增长"""
+    # 按最大规模生成一次测试数据，较小规模只取其中一部分文件
+    test_dir = generate_test_data(max(SCALABILITY_SCALES))
+
+    # 每个规模使用全新的配置和索引，避免在已写入较小规模文件的索引上重复索引
+    index_times = {}
+    for scale in SCALABILITY_SCALES:
+        benchmark = PerformanceBenchmark(temp_config_factory(f"scale_{scale}"))
+        results = benchmark.benchmark_indexing(test_dir, limit=scale)
+        index_times[scale] = results["total_index_time"]
 
-    # 验证可扩展性：性能应该随规模线性或亚线性增长
     # 注意：如果索引时间为0（初始化失败），跳过此验证
-    for scale in scales[1:]:
-        prev_scale = scales[0]
+    prev_scale = SCALABILITY_SCALES[0]
+    prev_time = index_times[prev_scale]
+    for scale in SCALABILITY_SCALES[1:]:
         ratio = scale / prev_scale
-        prev_time = scale_results[prev_scale]["indexing"]["total_index_time"]
-        curr_time = scale_results[scale]["indexing"]["total_index_time"]
+        curr_time = index_times[scale]
 
         # 如果任一索引时间为0（可能是测试环境污染），跳过可扩展性验证
         if prev_time <= 0 or curr_time <= 0:
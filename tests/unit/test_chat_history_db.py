@@ -1,33 +1,159 @@
 """Chat History DB 单元测试"""
 
 import os
-import sys
+import sqlite3
 import tempfile
 import threading
-import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
 import pytest
 
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-
+from backend.core import chat_history_db
 from backend.core.chat_history_db import ChatHistoryDB
 
 
+def _build_test_db() -> ChatHistoryDB:
+    """创建内存数据库实例（单元测试无需落盘）"""
+    return ChatHistoryDB(":memory:")
+
+
+def _build_legacy_db(tmp_path: Path) -> Path:
+    """创建使用旧版自增 id messages 表的数据库文件"""
+    db_path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(db_path)
+    conn.executescript("""
+        CREATE TABLE sessions (
+            session_id TEXT PRIMARY KEY, title TEXT, created_at REAL,
+            updated_at REAL, message_count INTEGER DEFAULT 0
+        );
+        CREATE TABLE messages (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, session_id TEXT,
+            role TEXT, content TEXT, timestamp REAL
+        );
+        CREATE INDEX idx_messages_session_id ON messages(session_id);
+        INSERT INTO sessions VALUES ('legacy_session', 't', 1.0, 2.0, 3);
+        INSERT INTO messages (session_id, role, content, timestamp)
+        VALUES ('legacy_session', 'user', 'Q1', 1.0),
+               ('legacy_session', 'assistant', 'A1', 1.0),
+               ('legacy_session', 'user', 'Q2', 2.0);
+    """)
+    conn.close()
+    return db_path
+
+
 class TestChatHistoryDB:
     """ChatHistoryDB 测试类"""
 
     @pytest.fixture
     def temp_db(self):
         """创建临时数据库"""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            db_path = os.path.join(tmpdir, "test_chat.db")
-            db = ChatHistoryDB(db_path)
-            yield db
-            db.close()
+        db = _build_test_db()
+        yield db
+        db.close_all()
 
-    def test_init(self, temp_db):
+    def test_init(self, tmp_path):
         """测试初始化"""
-        assert temp_db.db_path.exists()
+        db = ChatHistoryDB(str(tmp_path / "test_chat.db"))
+        assert db.db_path.exists()
+        db.close()
+
+    def test_init_with_pathlib_path(self, tmp_path):
+        """测试传入 pathlib.Path 初始化"""
+        db_path = tmp_path / "test_chat.db"
+        db = ChatHistoryDB(db_path)
+        assert db.db_path == db_path
+        assert db.create_session("test_session")
+        db.close()
+
+    def test_init_memory(self, temp_db):
+        """测试内存数据库在多个线程间共享"""
+        temp_db.create_session("test_session")
+
+        seen = []
+        thread = threading.Thread(
+            target=lambda: seen.append(temp_db.session_exists("test_session"))
+        )
+        thread.start()
+        thread.join()
+
+        assert seen == [True]
+        assert not temp_db.db_path.exists()
+
+    def test_wal_mode_enabled(self, tmp_path):
+        """测试文件数据库连接启用 WAL 日志模式"""
+        db = ChatHistoryDB(str(tmp_path / "test_chat.db"))
+        conn = db._get_connection()
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        # synchronous=NORMAL 对应值 1
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+        db.close()
+
+    def test_migrate_legacy_messages_table(self, tmp_path):
+        """测试旧版自增 id 的 messages 表迁移为 (session_id, seq) 主键"""
+        db_path = _build_legacy_db(tmp_path)
+
+        db = ChatHistoryDB(str(db_path))
+        db.add_message("legacy_session", "assistant", "A2")
+
+        messages = db.get_session_messages("legacy_session")
+        assert [m["content"] for m in messages] == ["Q1", "A1", "Q2", "A2"]
+        columns = [
+            row["name"]
+            for row in db._get_connection().execute("PRAGMA table_info(messages)")
+        ]
+        assert "id" not in columns and "seq" in columns
+        db.close()
+
+    def test_migrate_legacy_failure_rolls_back(self, tmp_path, monkeypatch):
+        """测试迁移中途失败时整体回滚，旧数据保留且下次启动可重新迁移"""
+        db_path = _build_legacy_db(tmp_path)
+        monkeypatch.setattr(
+            chat_history_db,
+            "_SQL_MIGRATE_LEGACY_MSGS",
+            "INSERT INTO messages SELECT * FROM missing_table",
+        )
+
+        with pytest.raises(sqlite3.OperationalError):
+            ChatHistoryDB(str(db_path))
+
+        conn = sqlite3.connect(db_path)
+        tables = {
+            row[0]
+            for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
+        }
+        contents = [row[0] for row in conn.execute("SELECT content FROM messages")]
+        conn.close()
+        assert "messages_legacy" not in tables
+        assert contents == ["Q1", "A1", "Q2"]
+
+        monkeypatch.undo()
+        db = ChatHistoryDB(str(db_path))
+        messages = db.get_session_messages("legacy_session")
+        assert [m["content"] for m in messages] == ["Q1", "A1", "Q2"]
+        db.close()
+
+    def test_migrate_resumes_from_leftover_legacy_table(self, tmp_path):
+        """测试旧版本中断迁移留下的 messages_legacy 会在启动时并入新表"""
+        db_path = _build_legacy_db(tmp_path)
+        conn = sqlite3.connect(db_path)
+        conn.executescript(f"""
+            DROP INDEX idx_messages_session_id;
+            ALTER TABLE messages RENAME TO messages_legacy;
+            {chat_history_db._SQL_CREATE_MESSAGES};
+            INSERT INTO messages VALUES ('legacy_session', 1, 'assistant', 'A2', 3.0);
+        """)
+        conn.close()
+
+        db = ChatHistoryDB(str(db_path))
+
+        messages = db.get_session_messages("legacy_session")
+        assert [m["content"] for m in messages] == ["Q1", "A1", "Q2", "A2"]
+        legacy = db._get_connection().execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'messages_legacy'"
+        )
+        assert legacy.fetchone() is None
+        db.close()
 
     def test_init_default_path(self):
         """测试默认路径初始化"""
@@ -85,6 +211,25 @@ class TestChatHistoryDB:
         result = temp_db.add_message("test_session", "invalid_role", "Hello")
         assert result
 
+    def test_add_messages_bulk(self, temp_db):
+        """测试批量添加消息"""
+        result = temp_db.add_messages_bulk(
+            "test_session",
+            [("user", "Hello"), ("assistant", "Hi there"), ("user", "Bye")],
+        )
+        assert result
+
+        messages = temp_db.get_session_messages("test_session")
+        assert [m["content"] for m in messages] == ["Hello", "Hi there", "Bye"]
+
+        session = temp_db.get_all_sessions()[0]
+        assert session["message_count"] == 3
+        assert session["title"] == "Hello"
+
+    def test_add_messages_bulk_invalid_session(self, temp_db):
+        """测试无效会话ID批量添加消息"""
+        assert not temp_db.add_messages_bulk("", [("user", "Hello")])
+
     def test_get_session_messages(self, temp_db):
         """测试获取会话消息"""
         temp_db.create_session("test_session")
@@ -111,11 +256,13 @@ class TestChatHistoryDB:
     def test_get_session_messages_with_limit(self, temp_db):
         """测试限制消息数量"""
         temp_db.create_session("test_session")
-        for i in range(10):
-            temp_db.add_message("test_session", "user", f"Message {i}")
+        temp_db.add_messages_bulk(
+            "test_session", [("user", f"Message {i}") for i in range(10)]
+        )
 
         messages = temp_db.get_session_messages("test_session", limit=5)
         assert len(messages) == 5
+        assert messages[0]["content"] == "Message 0"
 
     def test_get_all_sessions(self, temp_db):
         """测试获取所有会话"""
@@ -133,8 +280,8 @@ class TestChatHistoryDB:
 
     def test_get_all_sessions_order(self, temp_db):
         """测试会话排序"""
+        temp_db._clock = iter([1000.0, 1001.0]).__next__
         temp_db.create_session("session1")
-        time.sleep(0.01)
         temp_db.create_session("session2")
 
         sessions = temp_db.get_all_sessions()
@@ -223,11 +370,11 @@ class TestChatHistoryDB:
 
     def test_update_timestamp(self, temp_db):
         """测试更新时间戳"""
+        temp_db._clock = iter([1000.0, 1001.0]).__next__
         temp_db.create_session("test_session")
         old_sessions = temp_db.get_all_sessions()
         old_time = old_sessions[0]["updated_at"]
 
-        time.sleep(0.01)
         temp_db.add_message("test_session", "user", "Hello")
 
         new_sessions = temp_db.get_all_sessions()
@@ -240,49 +387,31 @@ class TestChatHistoryDBEdgeCases:
 
     @pytest.fixture
     def temp_db(self):
-        with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmpdir:
-            db_path = os.path.join(tmpdir, "test_chat.db")
-            db = ChatHistoryDB(db_path)
-            yield db
-            db.close()
-            import time
-
-            time.sleep(0.1)  # Windows 下等待文件锁释放
+        db = _build_test_db()
+        yield db
+        db.close_all()
 
-    def test_concurrent_access(self, temp_db):
+    def test_concurrent_access(self, tmp_path):
         """测试并发访问"""
+        # 并发写入走真实的文件数据库（WAL），与生产环境一致
+        temp_db = ChatHistoryDB(str(tmp_path / "test_chat.db"))
         temp_db.create_session("test_session")
 
-        errors = []
-
-        def add_messages():
-            for i in range(50):
-                for attempt in range(10):
-                    try:
-                        temp_db.add_message("test_session", "user", f"Message {i}")
-                        break
-                    except Exception as e:
-                        if attempt == 9:
-                            errors.append(str(e))
-                        import time
+        def add_batch(worker):
+            # 每批 50 条在一个事务内写入，两个线程只需竞争两次写锁
+            batch = [("user", f"{worker}-{i}") for i in range(50)]
+            return temp_db.add_messages_bulk("test_session", batch)
 
-                        time.sleep(0.01 * (attempt + 1))
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            assert all(executor.map(add_batch, range(2)))
 
-        threads = [
-            threading.Thread(target=add_messages),
-            threading.Thread(target=add_messages),
+        contents = [m["content"] for m in temp_db.get_session_messages("test_session")]
+        assert len(contents) == 100
+        # 每批消息连续且保持批内顺序
+        assert sorted([contents[:50], contents[50:]]) == [
+            [f"{worker}-{i}" for i in range(50)] for worker in range(2)
         ]
-
-        for t in threads:
-            t.start()
-        for t in threads:
-            t.join()
-
-        if errors:
-            pytest.fail(f"Concurrent write errors: {errors[:3]}")
-
-        messages = temp_db.get_session_messages("test_session")
-        assert len(messages) == 100
+        temp_db.close_all()
 
     def test_very_long_message(self, temp_db):
         """测试超长消息"""
@@ -329,15 +458,19 @@ class TestChatHistoryDBEdgeCases:
     def test_multiple_databases(self):
         """测试多个数据库实例"""
         with tempfile.TemporaryDirectory() as tmpdir:
-            db_path = os.path.join(tmpdir, "test_chat.db")
-            db1 = ChatHistoryDB(db_path)
-            db2 = ChatHistoryDB(db_path)  # 相同路径
+            # 文件名含空格，URI 中会被编码为 %20
+            db_path = os.path.join(tmpdir, "test chat.db")
+            # 相同文件，共享缓存模式下两个实例的连接共用页缓存
+            uri = Path(db_path).as_uri() + "?cache=shared"
+            db1 = ChatHistoryDB(uri)
+            db2 = ChatHistoryDB(uri)
 
             db1.create_session("session1")
             db2.create_session("session2")
 
             sessions = db1.get_all_sessions()
             assert len(sessions) == 2
+            assert db1.db_path == Path(db_path)
 
             db1.close()
             db2.close()
@@ -357,19 +490,24 @@ class TestChatHistoryDBEdgeCases:
         assert result
 
 
+@pytest.fixture(scope="class")
+def shared_db():
+    """同一测试类共享一个数据库，建表只执行一次"""
+    db = _build_test_db()
+    yield db
+    db.close_all()
+
+
 class TestChatHistoryDBSessionValidation:
     """ChatHistoryDB 会话ID验证测试"""
 
     @pytest.fixture
-    def temp_db(self):
-        with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmpdir:
-            db_path = os.path.join(tmpdir, "test_chat.db")
-            db = ChatHistoryDB(db_path)
-            yield db
-            db.close()
-            import time
-
-            time.sleep(0.1)
+    def temp_db(self, shared_db):
+        """每个参数化用例结束后清空数据，保证用例间相互独立"""
+        yield shared_db
+        with shared_db.get_cursor() as cursor:
+            cursor.execute("DELETE FROM messages")
+            cursor.execute("DELETE FROM sessions")
 
     @pytest.mark.parametrize(
         "valid_id",
@@ -380,7 +518,7 @@ class TestChatHistoryDBSessionValidation:
             "SESSION_123",
             "123session",
             "a",
-            "A" * 64,
+            pytest.param("A" * 64, id="max_length"),
         ],
     )
     def test_valid_session_ids(self, temp_db, valid_id):
@@ -397,7 +535,9 @@ class TestChatHistoryDBSessionValidation:
             "test session",  # 空格
             "test\tsession",  # 制表符
             "test\nsession",  # 换行
-            "a" * 257,  # 过长
+            "session\n",  # 末尾换行
+            "session１２３",  # 全角数字
+            pytest.param("a" * 257, id="too_long"),  # 过长
         ],
     )
     def test_invalid_session_ids(self, temp_db, invalid_id):
@@ -12,8 +12,6 @@
 """
 
 import concurrent.futures
-import os
-import sys
 import threading
 import time
 from typing import Any, Callable, List
@@ -21,8 +19,6 @@ from unittest.mock import Mock
 
 import pytest
 
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
-
 
 class TestIndexManagerConcurrency:
     """索引管理器并发测试"""
@@ -1,10 +1,28 @@
 import tempfile
 from pathlib import Path
 
+import pytest
 import yaml
 
 from backend.utils.config_loader import ConfigLoader
 
+# 优先使用 libyaml 的 C 实现，未编译 libyaml 时回退到纯 Python 版本
+_YamlDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+def _dump_yaml(data) -> str:
+    return yaml.dump(
+        data, Dumper=_YamlDumper, allow_unicode=True, default_flow_style=False
+    )
+
+
+@pytest.fixture(scope="session")
+def initial_yaml_text():
+    """预先序列化的初始配置（内容固定，整个会话只生成一次）"""
+    return _dump_yaml(
+        {"system": {"app_name": "Initial App", "data_dir": "./initial_data"}}
+    )
+
 
 def test_config_loader_initialization():
     """测试配置加载器初始化"""
@@ -20,8 +38,7 @@ def test_config_loader_initialization():
             },
         }
 
-        with open(config_path, "w", encoding="utf-8") as f:
-            yaml.dump(test_config, f, allow_unicode=True, default_flow_style=False)
+        config_path.write_text(_dump_yaml(test_config), encoding="utf-8")
 
         # 测试加载配置
         config_loader = ConfigLoader(str(config_path))
@@ -39,18 +56,13 @@ def test_config_loader_defaults():
     assert config_loader.getint("nonexistent", "max_file_size", 100) == 100
 
 
-def test_config_loader_update():
+def test_config_loader_update(initial_yaml_text):
     """测试配置更新功能"""
     with tempfile.TemporaryDirectory() as tmpdir:
         config_path = Path(tmpdir) / "test_config.yaml"
 
         # 创建初始配置
-        initial_config = {
-            "system": {"app_name": "Initial App", "data_dir": "./initial_data"}
-        }
-
-        with open(config_path, "w", encoding="utf-8") as f:
-            yaml.dump(initial_config, f, allow_unicode=True, default_flow_style=False)
+        config_path.write_text(initial_yaml_text, encoding="utf-8")
 
         config_loader = ConfigLoader(str(config_path))
 
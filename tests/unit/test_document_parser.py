@@ -1,19 +1,16 @@
-import sys
-from pathlib import Path
+import subprocess
+from contextlib import ExitStack
 from unittest.mock import Mock, PropertyMock, patch
 
 import pytest
 
-# 添加项目根目录到路径
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from backend.core.document_parser import DocumentParser
+from tests.factories import FakeConfig
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def parser():
-    config = Mock()
-    config.getint.return_value = 100
+    config = FakeConfig({"file_scanner": {"parse_timeout": 100, "max_file_size": 100}})
     p = DocumentParser(config)
     return p
 
@@ -42,44 +39,134 @@ def test_parse_generic_fallback(mock_textract, parser):
         mock_textract.process.assert_called_once()
 
 
-@patch("backend.core.document_parser.win32com", None)
 @patch("backend.core.document_parser.textract")
-def test_parse_doc_antiword_error(mock_textract, parser):
-    mock_textract.process.side_effect = Exception(
-        "Command failed with exit code 127: antiword ..."
+@patch("backend.core.document_parser.subprocess.run")
+@patch("backend.core.document_parser.shutil.which", return_value="/usr/bin/ps2ascii")
+def test_parse_generic_cli_extractor(mock_which, mock_run, mock_textract, parser):
+    # 已知格式直接调用命令行工具，不经过 textract
+    mock_run.return_value = subprocess.CompletedProcess(
+        args=[], returncode=0, stdout=b"cli content"
     )
-    result = parser._parse_doc_win32("test.doc")
-    assert "缺少 Microsoft Word 或 antiword 工具" in result
 
+    with patch("os.path.exists", return_value=True):
+        result = parser.extract_text("test.ps")
 
-@patch("backend.core.document_parser.win32com", None)
-@patch("backend.core.document_parser.textract")
-def test_parse_doc_no_win32_fallback(mock_textract, parser):
-    mock_textract.process.return_value = b"doc content"
-    result = parser._parse_doc_win32("test.doc")
-    assert "doc content" in result
+    assert "cli content" in result
+    assert mock_run.call_args.args[0] == ["ps2ascii", "test.ps"]
+    mock_textract.process.assert_not_called()
 
 
-@patch("backend.core.document_parser.win32com", None)
 @patch("backend.core.document_parser.textract")
-def test_parse_doc_failure(mock_textract, parser):
-    mock_textract.process.side_effect = Exception("antiword failed")
-    result = parser._parse_doc_win32("test.doc")
-    assert "错误" in result
+@patch("backend.core.document_parser.subprocess.run")
+@patch("backend.core.document_parser.shutil.which", return_value="/usr/bin/ps2ascii")
+def test_parse_generic_cli_failure_falls_back(
+    mock_which, mock_run, mock_textract, parser
+):
+    mock_run.return_value = subprocess.CompletedProcess(
+        args=[], returncode=1, stdout=b""
+    )
+    mock_textract.process.return_value = b"textract content"
 
+    with patch("os.path.exists", return_value=True):
+        result = parser.extract_text("test.ps")
+
+    assert "textract content" in result
+    mock_textract.process.assert_called_once()
+
+
+def _mock_win32(word_mode):
+    """按场景构造 win32com 替身；None 表示未安装 pywin32"""
+    if word_mode is None:
+        return None
+
+    mock_win32 = Mock()
+    if word_mode == "dispatch_error":
+        # win32com 存在但 Word 不可用
+        mock_win32.client.Dispatch.side_effect = Exception("No Word")
+        return mock_win32
 
-@patch("backend.core.document_parser.win32com")
-def test_parse_doc_win32_success(mock_win32, parser):
     mock_word = Mock()
     mock_doc = Mock()
-    mock_doc.Content.Text = "win32 content"
+    if word_mode == "content_error":
+        type(mock_doc).Content = PropertyMock(side_effect=Exception("COM Error"))
+    else:
+        mock_doc.Content.Text = "win32 content"
     mock_word.Documents.Open.return_value = mock_doc
     mock_win32.client.Dispatch.return_value = mock_word
+    return mock_win32
+
+
+# (Word 状态, textract 返回值或异常, 转换为 docx 的结果, 期望结果包含的文本)
+# 转换结果为 None 时不替换 _convert_doc_to_docx，走真实的失败路径
+_PARSE_DOC_SCENARIOS = [
+    pytest.param(
+        None,
+        Exception("Command failed with exit code 127: antiword ..."),
+        None,
+        "缺少 Microsoft Word 或 antiword 工具",
+        id="antiword_error",
+    ),
+    pytest.param(None, b"doc content", None, "doc content", id="no_win32_fallback"),
+    pytest.param(None, Exception("antiword failed"), None, "错误", id="failure"),
+    pytest.param("ok", None, None, "win32 content", id="win32_success"),
+    pytest.param(
+        "content_error",
+        None,
+        "converted content",
+        "converted content",
+        id="win32_retry_convert",
+    ),
+    pytest.param(
+        "dispatch_error",
+        b"textract content",
+        None,
+        "textract content",
+        id="win32_fail_fallback_textract",
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    "word_mode, textract_effect, convert_result, expected", _PARSE_DOC_SCENARIOS
+)
+def test_parse_doc_win32(parser, word_mode, textract_effect, convert_result, expected):
+    mock_textract = Mock()
+    if isinstance(textract_effect, Exception):
+        mock_textract.process.side_effect = textract_effect
+    else:
+        mock_textract.process.return_value = textract_effect
+
+    with ExitStack() as stack:
+        stack.enter_context(
+            patch("backend.core.document_parser.win32com", _mock_win32(word_mode))
+        )
+        stack.enter_context(
+            patch("backend.core.document_parser.textract", mock_textract)
+        )
+        stack.enter_context(patch.dict("sys.modules", {"pythoncom": Mock()}))
+        stack.enter_context(patch("os.path.abspath", return_value="C:\\test.doc"))
+        # 与本机是否安装 antiword 无关，固定走 textract 后备
+        stack.enter_context(
+            patch("backend.core.document_parser.shutil.which", return_value=None)
+        )
+        mock_convert = None
+        if convert_result is not None:
+            mock_convert = stack.enter_context(
+                patch.object(
+                    parser, "_convert_doc_to_docx", return_value=convert_result
+                )
+            )
 
-    with patch.dict("sys.modules", {"pythoncom": Mock()}):
-        with patch("os.path.abspath", return_value="C:\\test.doc"):
-            result = parser._parse_doc_win32("test.doc")
-            assert "win32 content" in result
+        result = parser._parse_doc_win32("test.doc")
+
+    if mock_convert is not None:
+        # 转换重试直接返回转换结果，不附加任何内容
+        assert result == expected
+        mock_convert.assert_called_once()
+    else:
+        assert expected in result
+    if textract_effect is not None:
+        mock_textract.process.assert_called_once()
 
 
 @patch("backend.core.document_parser.win32com")
@@ -100,43 +187,3 @@ def test_convert_doc_to_docx(mock_win32, parser):
                     ):
                         result = parser._convert_doc_to_docx("test.doc")
                         assert result == "converted content"
-
-
-@patch("backend.core.document_parser.win32com")
-def test_parse_doc_win32_retry_convert(mock_win32, parser):
-    mock_word = Mock()
-    mock_doc_fail = Mock()
-    p = PropertyMock(side_effect=Exception("COM Error"))
-    type(mock_doc_fail).Content = p
-
-    mock_win32.client.Dispatch.return_value = mock_word
-    mock_word.Documents.Open.return_value = mock_doc_fail
-
-    # Mock _convert_doc_to_docx
-    parser._convert_doc_to_docx = Mock(return_value="converted content")
-
-    with patch.dict("sys.modules", {"pythoncom": Mock()}):
-        with patch("os.path.abspath", return_value="C:\\test.doc"):
-            result = parser._parse_doc_win32("test.doc")
-            assert result == "converted content"
-            parser._convert_doc_to_docx.assert_called_once()
-
-
-@patch("backend.core.document_parser.win32com")
-@patch("backend.core.document_parser.textract")
-def test_parse_doc_win32_fail_fallback_textract(mock_textract, mock_win32, parser):
-    # Simulate win32com present but failing (e.g. no Word installed)
-    mock_win32.client.Dispatch.side_effect = Exception("No Word")
-
-    # Mock textract success
-    mock_textract.process.return_value = b"textract content"
-
-    with patch.dict("sys.modules", {"pythoncom": Mock()}):
-        # We also need _convert_doc_to_docx to fail or return None.
-        # Since _convert_doc_to_docx calls Dispatch, and we mocked
-        # Dispatch to fail, it will return None
-
-        result = parser._parse_doc_win32("test.doc")
-
-        assert "textract content" in result
-        mock_textract.process.assert_called_once()
@@ -0,0 +1,211 @@
+"""测试数据工厂单元测试"""
+
+import pytest
+
+from tests.factories import (
+    ConfigFactory,
+    DocumentFactory,
+    MessageFactory,
+    SearchResultFactory,
+    SessionFactory,
+)
+
+
+class TestConfigFactory:
+    """ConfigFactory 测试类"""
+
+    @pytest.mark.parametrize(
+        "create", [ConfigFactory.create_minimal, ConfigFactory.create_full]
+    )
+    def test_default_returns_fresh_mutable_dict(self, create):
+        """测试默认返回可修改的新字典，修改不影响后续调用"""
+        config = create()
+        config["system"]["data_dir"] = "/tmp/changed"
+        config["extra"] = {}
+
+        fresh = create()
+        assert isinstance(fresh, dict)
+        assert fresh["system"]["data_dir"] == "./data"
+        assert "extra" not in fresh
+
+    @pytest.mark.parametrize(
+        "create", [ConfigFactory.create_minimal, ConfigFactory.create_full]
+    )
+    def test_read_only_view(self, create):
+        """测试只读视图与默认配置内容一致，且嵌套层级同样不可修改"""
+        view = create(read_only=True)
+        config = create()
+
+        assert view.keys() == config.keys()
+        assert view["system"] == config["system"]
+        with pytest.raises(TypeError):
+            view["system"]["data_dir"] = "/tmp/changed"
+        assert create(read_only=True) is view
+
+    def test_read_only_lists_become_tuples(self):
+        """测试只读视图中的列表被冻结为元组"""
+        view = ConfigFactory.create_full(read_only=True)
+        assert view["file_scanner"]["scan_paths"] == ("./documents",)
+
+
+class TestDocumentFactoryBatch:
+    """DocumentFactory.create_batch 测试类"""
+
+    def test_same_seed_is_deterministic(self):
+        """测试相同种子生成完全相同的批次，不同种子内容不同"""
+        first = DocumentFactory.create_batch(20, seed=42)
+        second = DocumentFactory.create_batch(20, seed=42)
+        other = DocumentFactory.create_batch(20, seed=7)
+
+        def strip_time(docs):
+            return [{k: v for k, v in d.items() if k != "modified"} for d in docs]
+
+        assert strip_time(first) == strip_time(second)
+        assert [d["content"] for d in first] != [d["content"] for d in other]
+
+    def test_sizes_and_word_counts(self):
+        """测试 size 等于内容的 UTF-8 字节数，且每篇词数在 10-100 之间"""
+        docs = DocumentFactory.create_batch(50, seed=1)
+
+        for doc in docs:
+            assert doc["size"] == len(doc["content"].encode("utf-8"))
+            assert isinstance(doc["size"], int)
+            assert 10 <= len(doc["content"].split(" ")) <= 100
+
+    def test_file_types_and_paths(self):
+        """测试文件类型取自给定列表，路径与文件名一致"""
+        docs = DocumentFactory.create_batch(
+            10, file_types=["md"], base_path="/data", seed=3
+        )
+
+        assert [d["filename"] for d in docs] == [f"doc_{i}.md" for i in range(10)]
+        assert all(d["file_type"] == "md" for d in docs)
+        assert all(d["path"] == f"/data/{d['filename']}" for d in docs)
+
+    def test_empty_batch(self):
+        """测试数量为 0 时返回空列表"""
+        assert DocumentFactory.create_batch(0, seed=0) == []
+
+
+class TestSessionFactoryBatch:
+    """SessionFactory.create_batch 测试类"""
+
+    def test_count_and_shape(self):
+        """测试数量、字段以及随机字段的取值范围"""
+        sessions = SessionFactory.create_batch(30, seed=1)
+
+        assert len(sessions) == 30
+        created = {s["created_at"] for s in sessions}
+        assert len(created) == 1  # 整批共用一个创建时间
+        for session in sessions:
+            assert set(session) == {
+                "session_id",
+                "name",
+                "created_at",
+                "updated_at",
+                "message_count",
+            }
+            assert session["session_id"].startswith("sess_")
+            assert 60 <= session["updated_at"] - session["created_at"] <= 3600
+            assert 0 <= session["message_count"] <= 50
+
+    def test_seed_determinism(self):
+        """测试相同种子生成相同的随机字段，不同种子生成不同的批次"""
+
+        def random_fields(sessions):
+            return [
+                (
+                    s["session_id"],
+                    s["name"],
+                    s["updated_at"] - s["created_at"],
+                    s["message_count"],
+                )
+                for s in sessions
+            ]
+
+        first = SessionFactory.create_batch(20, seed=42)
+        second = SessionFactory.create_batch(20, seed=42)
+        other = SessionFactory.create_batch(20, seed=7)
+
+        assert random_fields(first) == random_fields(second)
+        assert random_fields(first) != random_fields(other)
+
+    def test_empty_batch(self):
+        """测试数量为 0 时返回空列表"""
+        assert SessionFactory.create_batch(0, seed=0) == []
+
+
+def _without_timestamps(conversations):
+    """去掉时间戳（取自当前时间），便于比较两次生成的对话"""
+    return [
+        [{k: v for k, v in m.items() if k != "timestamp"} for m in conv]
+        for conv in conversations
+    ]
+
+
+class TestMessageFactoryConversations:
+    """MessageFactory.create_conversations 测试类"""
+
+    def test_counts_and_role_alternation(self):
+        """测试对话数、每个对话的轮数以及 user/assistant 交替顺序"""
+        conversations = MessageFactory.create_conversations(4, turns=3, seed=1)
+
+        assert len(conversations) == 4
+        for conv in conversations:
+            assert len(conv) == 6
+            assert [m["role"] for m in conv] == ["user", "assistant"] * 3
+
+    def test_session_id_per_conversation(self):
+        """测试同一对话内 session_id 相同，不同对话之间互不相同"""
+        conversations = MessageFactory.create_conversations(5, turns=2, seed=2)
+
+        session_ids = []
+        for conv in conversations:
+            assert len({m["session_id"] for m in conv}) == 1
+            session_ids.append(conv[0]["session_id"])
+        assert len(set(session_ids)) == 5
+
+    def test_seed_determinism(self):
+        """测试相同种子生成相同内容，不同种子生成不同内容"""
+        first = MessageFactory.create_conversations(5, turns=4, seed=42)
+        second = MessageFactory.create_conversations(5, turns=4, seed=42)
+        other = MessageFactory.create_conversations(5, turns=4, seed=7)
+
+        assert _without_timestamps(first) == _without_timestamps(second)
+        assert _without_timestamps(first) != _without_timestamps(other)
+
+    def test_empty(self):
+        """测试数量或轮数为 0 的边界情况"""
+        assert MessageFactory.create_conversations(0, seed=0) == []
+        assert MessageFactory.create_conversations(2, turns=0, seed=0) == [[], []]
+
+
+class TestSearchResultFactoryBatch:
+    """SearchResultFactory.create_batch 测试类"""
+
+    def test_scores_sorted_descending_within_range(self):
+        """测试分数降序排列、保留两位小数且落在给定区间内"""
+        results = SearchResultFactory.create_batch(
+            100, min_score=0.2, max_score=0.8, seed=5
+        )
+
+        scores = [r["score"] for r in results]
+        assert scores == sorted(scores, reverse=True)
+        assert all(type(score) is float for score in scores)
+        assert all(0.2 <= score <= 0.8 for score in scores)
+        assert all(score == round(score, 2) for score in scores)
+
+    def test_ties_keep_generation_order(self):
+        """测试同分结果保持生成顺序（稳定排序）"""
+        results = SearchResultFactory.create_batch(
+            10, min_score=0.5, max_score=0.5, seed=0
+        )
+        assert [r["filename"] for r in results] == [
+            f"result_{i}.txt" for i in range(10)
+        ]
+
+    def test_same_seed_is_deterministic(self):
+        """测试相同种子生成相同的结果顺序与分数"""
+        first = SearchResultFactory.create_batch(30, seed=9)
+        second = SearchResultFactory.create_batch(30, seed=9)
+        assert first == second
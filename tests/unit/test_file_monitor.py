@@ -2,31 +2,28 @@
 # -*- coding: utf-8 -*-
 """文件监控功能测试"""
 
-import sys
-from pathlib import Path
 from unittest.mock import Mock
 
 import pytest
 
-# 添加项目根目录到路径
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from backend.core.file_monitor import FileChangeHandler, FileMonitor
+from tests.factories import FakeConfig
+
+# 模拟配置数据，模块导入时构建一次
+_MOCK_CONFIG = {
+    "monitor": {
+        "directories": "",
+        "enabled": True,
+        "debounce_time": 0.1,
+        "ignored_patterns": ".git;.svn;__pycache__",
+    }
+}
 
 
 @pytest.fixture
 def mock_config():
     """创建模拟配置"""
-    config = Mock()
-    config.get.side_effect = lambda section, key, default=None: {
-        ("monitor", "directories", ""): "",
-        ("monitor", "enabled", True): True,
-        ("monitor", "debounce_time", 0.5): 0.1,
-        ("monitor", "ignored_patterns", ".git;.svn"): ".git;.svn;__pycache__",
-    }.get((section, key, default), default)
-    config.getboolean.return_value = True
-    config.getfloat.return_value = 0.1
-    return config
+    return FakeConfig(_MOCK_CONFIG)
 
 
 class TestFileMonitorInitialization:
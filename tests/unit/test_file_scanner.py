@@ -1,3 +1,4 @@
+import os
 from unittest.mock import Mock
 
 import pytest
@@ -5,7 +6,7 @@ import pytest
 from backend.core.file_scanner import FileScanner
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_scanner():
     config = Mock()
     # Mock getlist to return common extensions
@@ -20,18 +21,22 @@ def mock_scanner():
     return scanner
 
 
-def test_file_scanner_should_index(mock_scanner, tmp_path):
-    """测试文件过滤"""
-    # 创建临时PDF文件
-    valid_file = tmp_path / "test.pdf"
-    valid_file.write_text("test content")
+# 12 字节普通文件的 stat 结果，扩展名过滤测试无需在磁盘上创建文件
+_SMALL_FILE_STAT = os.stat_result((0o100644, 0, 0, 1, 0, 0, 12, 0, 0, 0))
+
 
-    # 创建临时EXE文件
-    invalid_file = tmp_path / "test.exe"
-    invalid_file.write_text("test content")
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("test.pdf", True),
+        ("test.exe", False),  # 非目标扩展
+    ],
+)
+def test_file_scanner_should_index(mock_scanner, name, expected):
+    """测试文件过滤"""
+    path = f"/any/path/{name}"
 
-    assert mock_scanner._should_index(str(valid_file)) is True
-    assert mock_scanner._should_index(str(invalid_file)) is False  # 非目标扩展
+    assert mock_scanner._should_index(path, _SMALL_FILE_STAT) is expected
 
 
 def test_is_system_file(mock_scanner):
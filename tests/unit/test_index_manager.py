@@ -1,198 +1,102 @@
 import platform
-import sys
-import tempfile
+import time
 from pathlib import Path
-from unittest.mock import Mock
 
 import pytest
 
-# 添加项目根目录到Python路径
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from backend.core.index_manager import IndexManager
-from backend.utils.config_loader import ConfigLoader
-
-
-def test_index_manager_initialization():
+from tests.factories import FakeConfig
+
+
+def _build_config(tmpdir):
+    """构建指向临时目录的只读配置（支持 get/getint/getboolean）"""
+    config_data = {
+        "system": {"data_dir": tmpdir},
+        "index": {
+            "tantivy_path": f"{tmpdir}/tantivy_test",
+            "hnsw_path": f"{tmpdir}/hnsw_test",
+            "metadata_path": f"{tmpdir}/metadata_test",
+            "chunk_enabled": False,  # 禁用 chunk 以避免 embedding 依赖
+        },
+        "embedding": {
+            "enabled": False,  # 禁用嵌入模型以避免依赖问题
+            "provider": "fastembed",
+            "model_name": "BAAI/bge-small-zh-v1.5",
+        },
+    }
+    return FakeConfig(config_data)
+
+
+@pytest.fixture(scope="module")
+def index_manager(tmp_path_factory):
+    """模块内共享的索引管理器，Tantivy/HNSW 索引只创建一次
+
+    各用例写入的文档路径互不相同，彼此的状态不会影响断言。
+    目录由 pytest 统一清理，Tantivy 后台合并线程不会导致清理报错。
+    """
+    tmpdir = str(tmp_path_factory.mktemp("idx"))
+    manager = IndexManager(_build_config(tmpdir))
+    yield manager, tmpdir
+    manager.close()
+
+
+def _make_doc(tmpdir, filename, content, keywords):
+    """创建测试文件并返回对应的索引文档"""
+    current_time = int(time.time())
+    path = f"{tmpdir}/{filename}"
+    Path(path).write_text(content, encoding="utf-8")
+    return {
+        "path": path,
+        "filename": filename,
+        "content": content,
+        "file_type": "txt",
+        "size": 1024,
+        "created": current_time,
+        "modified": current_time,
+        "keywords": keywords,
+    }
+
+
+def test_index_manager_initialization(index_manager):
     """测试索引管理器初始化"""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        # 创建测试配置
-        config_data = {
-            "system": {"data_dir": tmpdir},
-            "index": {
-                "tantivy_path": f"{tmpdir}/tantivy_test",
-                "hnsw_path": f"{tmpdir}/hnsw_test",
-                "metadata_path": f"{tmpdir}/metadata_test",
-                "chunk_enabled": False,
-            },
-            "embedding": {
-                "enabled": False,  # 禁用嵌入模型以避免依赖问题
-                "provider": "fastembed",
-                "model_name": "BAAI/bge-small-zh-v1.5",
-            },
-        }
-
-        # 创建配置加载器
-        mock_config = Mock(spec=ConfigLoader)
-        mock_config.get.side_effect = lambda section, key, default="": config_data.get(
-            section, {}
-        ).get(key, default)
-        mock_config.getint.side_effect = lambda section, key, default=0: int(
-            config_data.get(section, {}).get(key, default)
-            if config_data.get(section, {}).get(key) is not None
-            else default
-        )
-        mock_config.getboolean.side_effect = lambda section, key, default=False: (
-            config_data.get(section, {}).get(key, default)
-            if config_data.get(section, {}).get(key) is not None
-            else default
-        )
-
-        # 测试初始化
-        index_manager = IndexManager(mock_config)
-
-        assert index_manager is not None
-        assert hasattr(index_manager, "tantivy_index")
-        assert hasattr(index_manager, "vector_metadata")
+    manager, _ = index_manager
+
+    assert manager is not None
+    assert hasattr(manager, "tantivy_index")
+    assert hasattr(manager, "vector_metadata")
 
 
 @pytest.mark.skipif(
     platform.system() == "Windows",
     reason="Windows 文件锁定导致临时目录清理失败，Tantivy 索引句柄未释放",
 )
-def test_add_document():
+def test_add_document(index_manager):
     """测试添加文档功能"""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        # 创建测试配置 - 使用真实 ConfigLoader 确保正确初始化
-        config_data = {
-            "system": {"data_dir": tmpdir},
-            "index": {
-                "tantivy_path": f"{tmpdir}/tantivy_test",
-                "hnsw_path": f"{tmpdir}/hnsw_test",
-                "metadata_path": f"{tmpdir}/metadata_test",
-                "chunk_enabled": False,  # 禁用 chunk 以避免 embedding 依赖
-            },
-            "embedding": {
-                "enabled": False,  # 禁用嵌入模型以避免依赖问题
-                "provider": "fastembed",
-                "model_name": "BAAI/bge-small-zh-v1.5",
-            },
-        }
-
-        # 使用部分 mock：支持 get/getint/getboolean 但其他方法真实
-        mock_config = Mock(spec=ConfigLoader)
-        mock_config.get.side_effect = lambda section, key, default="": config_data.get(
-            section, {}
-        ).get(key, default)
-        mock_config.getint.side_effect = lambda section, key, default=0: int(
-            config_data.get(section, {}).get(key, default)
-            if config_data.get(section, {}).get(key) is not None
-            else default
-        )
-        mock_config.getboolean.side_effect = lambda section, key, default=False: (
-            config_data.get(section, {}).get(key, default)
-            if config_data.get(section, {}).get(key) is not None
-            else default
-        )
-
-        # 测试添加文档
-        index_manager = IndexManager(mock_config)
-
-        # 验证索引已初始化
-        assert index_manager.tantivy_index is not None, "Tantivy 索引未初始化"
-
-        # 准备测试文档
-        import time
-
-        current_time = int(time.time())
-        test_doc = {
-            "path": f"{tmpdir}/test.txt",
-            "filename": "test.txt",
-            "content": "这是一个测试文档",
-            "file_type": "txt",
-            "size": 1024,
-            "created": current_time,
-            "modified": current_time,
-            "keywords": "测试",
-        }
-
-        # 创建测试文件
-        Path(test_doc["path"]).write_text("这是一个测试文档", encoding="utf-8")
-
-        # 添加文档到索引
-        success = index_manager.add_document(test_doc)
-        assert success is True, f"add_document 返回 {success}，预期 True"
+    manager, tmpdir = index_manager
+
+    # 验证索引已初始化
+    assert manager.tantivy_index is not None, "Tantivy 索引未初始化"
+
+    test_doc = _make_doc(tmpdir, "test.txt", "这是一个测试文档", "测试")
+
+    # 添加文档到索引
+    success = manager.add_document(test_doc)
+    assert success is True, f"add_document 返回 {success}，预期 True"
 
 
 @pytest.mark.skipif(
     platform.system() == "Windows",
     reason="Windows 文件锁定导致临时目录清理失败，Tantivy 索引句柄未释放",
 )
-def test_search_functionality():
+def test_search_functionality(index_manager):
     """测试搜索功能"""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        # 创建测试配置
-        config_data = {
-            "system": {"data_dir": tmpdir},
-            "index": {
-                "tantivy_path": f"{tmpdir}/tantivy_test",
-                "hnsw_path": f"{tmpdir}/hnsw_test",
-                "metadata_path": f"{tmpdir}/metadata_test",
-                "chunk_enabled": False,
-            },
-            "embedding": {
-                "enabled": False,  # 禁用嵌入模型以避免依赖问题
-                "provider": "fastembed",
-                "model_name": "BAAI/bge-small-zh-v1.5",
-            },
-        }
-
-        # 创建配置加载器
-        mock_config = Mock(spec=ConfigLoader)
-        mock_config.get.side_effect = lambda section, key, default="": config_data.get(
-            section, {}
-        ).get(key, default)
-        mock_config.getint.side_effect = lambda section, key, default=0: int(
-            config_data.get(section, {}).get(key, default)
-            if config_data.get(section, {}).get(key) is not None
-            else default
-        )
-        mock_config.getboolean.side_effect = lambda section, key, default=False: (
-            config_data.get(section, {}).get(key, default)
-            if config_data.get(section, {}).get(key) is not None
-            else default
-        )
-
-        # 测试搜索功能
-        index_manager = IndexManager(mock_config)
-
-        # 添加测试文档
-        import time
-
-        current_time = int(time.time())
-        test_doc = {
-            "path": f"{tmpdir}/search_test.txt",
-            "filename": "search_test.txt",
-            "content": "这是一个用于搜索测试的文档",
-            "file_type": "txt",
-            "size": 1024,
-            "created": current_time,
-            "modified": current_time,
-            "keywords": "搜索 测试",
-        }
-
-        Path(test_doc["path"]).write_text(
-            "这是一个用于搜索测试的文档", encoding="utf-8"
-        )
-        index_manager.add_document(test_doc)
-
-        # 执行搜索
-        results = index_manager.search_text("搜索测试", limit=10)
-        assert len(results) >= 0  # 搜索不应该抛出异常
-
-
-if __name__ == "__main__":
-    test_index_manager_initialization()
-    test_add_document()
-    test_search_functionality()
-    print("所有索引管理器测试通过!")
+    manager, tmpdir = index_manager
+
+    test_doc = _make_doc(
+        tmpdir, "search_test.txt", "这是一个用于搜索测试的文档", "搜索 测试"
+    )
+    manager.add_document(test_doc)
+
+    # 执行搜索
+    results = manager.search_text("搜索测试", limit=10)
+    assert len(results) >= 0  # 搜索不应该抛出异常
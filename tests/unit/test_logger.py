@@ -3,15 +3,11 @@
 """日志功能测试"""
 
 import logging
-import sys
 import tempfile
 from pathlib import Path
 
 import pytest
 
-# 添加项目根目录到路径
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from backend.utils.logger import LogContext, LoggerConfig, LogLevel, setup_logger
 
 
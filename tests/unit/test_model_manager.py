@@ -2,55 +2,35 @@
 # -*- coding: utf-8 -*-
 """模型管理器功能测试"""
 
-import sys
-from pathlib import Path
 from unittest.mock import Mock
 
 import pytest
 
-# 添加项目根目录到路径
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from backend.core.model_manager import ModelManager
 
+# WSL/API 模式配置表，键为 (section, key)，默认值由调用方传入
+_WSL_CONFIG = {
+    ("ai_model", "api.api_url"): "http://localhost:8000/v1/chat/completions",
+    ("ai_model", "api.api_key"): "",
+    ("ai_model", "api.model_name"): "deepseek-ai/DeepSeek-V2.5",
+    ("ai_model", "api.system_prompt"): "",
+    ("ai_model", "mode"): "api",
+    ("ai_model", "api.provider"): "siliconflow",
+    ("ai_model", "api.max_tokens"): 2048,
+    ("ai_model", "api.max_context"): 8192,
+}
+
 
 @pytest.fixture
 def mock_config_wsl():
     """创建WSL配置的Mock"""
     config = Mock()
-
-    def mock_get(_section=None, key=None, default=None):
-        """Mock get 方法"""
-        if _section == "ai_model":
-            if key == "api.api_url":
-                return "http://localhost:8000/v1/chat/completions"
-            elif key == "api.api_key":
-                return ""
-            elif key == "api.model_name":
-                return "deepseek-ai/DeepSeek-V2.5"
-            elif key == "api.system_prompt":
-                return ""
-            elif key == "mode":
-                return "api"
-            elif key == "api.provider":
-                return "siliconflow"
-            elif key == "api.max_tokens":
-                return 2048
-            elif key == "api.max_context":
-                return 8192
-        return default
-
-    def mock_getint(_section=None, key=None, default=0):
-        """Mock getint 方法"""
-        if _section == "ai_model":
-            if key == "api.max_tokens":
-                return 2048
-            elif key == "api.max_context":
-                return 8192
-        return default
-
-    config.get.side_effect = mock_get
-    config.getint.side_effect = mock_getint
+    config.get.side_effect = lambda section=None, key=None, default=None: (
+        _WSL_CONFIG.get((section, key), default)
+    )
+    config.getint.side_effect = lambda section=None, key=None, default=0: (
+        _WSL_CONFIG.get((section, key), default)
+    )
     config.getboolean.return_value = True
     return config
 
@@ -1,12 +1,8 @@
 """Privacy Guard 单元测试"""
 
-import os
-import sys
-
 import pytest
 
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-
+from backend.core import privacy_guard
 from backend.core.privacy_guard import (
     PrivacyGuard,
     get_privacy_guard,
@@ -62,6 +58,11 @@ class TestPrivacyGuard:
         findings = guard.detect_sensitive(text)
         assert len(findings) == 3
 
+    def test_detect_sensitive_reports_each_span_once(self, guard):
+        """测试同一片段只按优先级最高的类型报告一次（身份证优先于银行卡）"""
+        findings = guard.detect_sensitive("ID: 622202199001011234")
+        assert [f[0] for f in findings] == ["id_card"]
+
     def test_detect_sensitive_none(self, guard):
         """测试无敏感信息"""
         text = "This is normal text"
@@ -82,6 +83,12 @@ class TestPrivacyGuard:
         assert "test@example.com" not in result
         assert "***" in result
 
+    def test_redact_email_with_cjk_local_part(self, guard):
+        """测试本地部分为汉字的邮箱同样被脱敏（\\w 按 Unicode 判定）"""
+        text = "联系人 张三@example.com，谢谢"
+        assert guard.detect_sensitive(text)[0][:2] == ("email", "张三@example.com")
+        assert "张三@example.com" not in guard.redact(text)
+
     def test_redact_id_card(self, guard):
         """测试身份证号脱敏"""
         text = "ID: 110101199001011234"
@@ -94,6 +101,14 @@ class TestPrivacyGuard:
         result = guard.redact("")
         assert result == ""
 
+    def test_redact_text_without_digits_or_at(self, guard, monkeypatch):
+        """测试不含数字和 "@" 的文本不进入合并正则扫描"""
+        monkeypatch.setattr(privacy_guard, "_COMBINED_PATTERN", None)
+        text = "这是一段普通的中文文本 with plain words"
+        assert guard.redact(text) == text
+        assert guard.detect_sensitive(text) == []
+        assert not guard.has_sensitive(text)
+
     def test_redact_no_sensitive(self, guard):
         """测试无敏感信息文本脱敏"""
         text = "Normal text content"
@@ -114,6 +129,15 @@ class TestPrivacyGuard:
         restored = guard.restore(redacted)
         assert "test@example.com" in restored
 
+    def test_restore_mixed_types(self, guard):
+        """测试多种类型一次脱敏后全部还原"""
+        text = "Phone: 13812345678, Email: test@example.com, IP: 192.168.1.1"
+        redacted = guard.redact(text)
+        assert "***手机号***" in redacted
+        assert "***邮箱***" in redacted
+        assert "***IP地址***" in redacted
+        assert guard.restore(redacted) == text
+
     def test_restore_empty(self, guard):
         """测试空文本还原"""
         result = guard.restore("")
@@ -145,8 +169,32 @@ class TestPrivacyGuard:
         guard._max_map_size = 5
         for i in range(10):
             guard.redact(f"Phone: 1381234567{i}")
-        # Cleanup is triggered when size exceeds max, but the exact count may vary
-        assert len(guard._mask_map) <= 10
+        assert len(guard._mask_map) == 5
+        # 最早的映射被淘汰，最近的保留
+        assert "13812345670" not in guard._mask_map.values()
+        assert "13812345679" in guard._mask_map.values()
+
+    def test_cleanup_within_single_redact(self, guard):
+        """测试单次脱敏超过上限时本次签发的标记不被淘汰，可完整还原"""
+        guard._max_map_size = 5
+        guard.redact("13800000000")
+        text = " ".join(f"1381234{i:04d}" for i in range(20))
+
+        redacted = guard.redact(text)
+
+        assert guard.restore(redacted) == text
+        # 超出上限的只有本次签发的标记，更早的条目照常淘汰
+        assert "13800000000" not in guard._mask_map.values()
+        assert len(guard._mask_map) == 20
+
+    def test_recently_used_mapping_survives_eviction(self, guard):
+        """测试重复出现的原文刷新 LRU 位置，不会被优先淘汰"""
+        guard._max_map_size = 2
+        guard.redact("13812345670")
+        guard.redact("13812345671")
+        guard.redact("13812345670")
+        guard.redact("13812345672")
+        assert set(guard._mask_map.values()) == {"13812345670", "13812345672"}
 
 
 class TestPrivacyGuardEdgeCases:
@@ -181,8 +229,9 @@ class TestPrivacyGuardEdgeCases:
         """测试多个相同手机号"""
         text = "Phone1: 13812345678, Phone2: 13812345678"
         result = guard.redact(text)
-        # Should redact both
-        assert result.count("***") >= 1
+        # Should redact both with the same marker
+        assert "13812345678" not in result
+        assert len(guard._mask_map) == 1
 
     def test_restore_after_clear(self, guard):
         """测试清除后还原"""
@@ -1,13 +1,9 @@
 """Query Processor 单元测试"""
 
-import os
-import sys
 from unittest.mock import Mock
 
 import pytest
 
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-
 from backend.core.query_processor import QueryProcessor
 
 
@@ -80,6 +76,15 @@ class TestQueryProcessor:
         assert query in result
         assert not any(r.endswith("说明") and "缓存一致性" in r for r in result)
 
+    def test_process_cached_result_is_fresh_list(self, processor):
+        """测试重复查询命中缓存，且返回的列表互不影响"""
+        first = processor.process("配置说明")
+        first.append("mutated")
+        second = processor.process("  配置说明  ")
+        assert "mutated" not in second
+        assert second == first[:-1]
+        assert processor._expand_cached.cache_info().hits == 1
+
     def test_expand_abbreviations_exact_match(self, processor):
         """测试缩写精确匹配"""
         result = processor._expand_abbreviations("API")
@@ -111,6 +116,17 @@ class TestQueryProcessor:
         result = processor._expand_synonyms("数据库")
         assert len(result) > 0
 
+    def test_expand_synonyms_overlapping_keys(self, processor):
+        """测试相互包含的同义词键各自展开（"解决方案" 与 "方案"）"""
+        result = processor._expand_synonyms("解决方案")
+        assert "solution" in result
+        assert "解决策略" in result
+
+    def test_expand_synonyms_english_word_boundary(self, processor):
+        """测试英文同义词键只匹配完整单词"""
+        assert processor._expand_synonyms("debug") == []
+        assert "错误 report" in processor._expand_synonyms("bug report")
+
     def test_generate_filename_variants(self, processor):
         """测试文件名变体生成"""
         result = processor._generate_filename_variants("project")
@@ -1,69 +1,82 @@
 """RAG Pipeline 单元测试"""
 
-import os
-import sys
-from unittest.mock import Mock, patch
+from types import SimpleNamespace
+from unittest.mock import DEFAULT, Mock, patch
 
 import pytest
 
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-
+from backend.core.model_manager import ModelManager
 from backend.core.rag_pipeline import DEFAULT_PROMPT, RAGPipeline
+from backend.core.search_engine import SearchEngine
+from tests.factories import FakeConfig
+
+# 模型限制只会被 RAGPipeline 读取，所有用例共享同一个字典
+_MODEL_LIMITS = {
+    "max_docs": 5,
+    "chunk_size": 2000,
+    "max_context": 4000,
+    "max_tokens": 500,
+    "temperature": 0.7,
+    "min_doc_score": 0.3,
+}
+
+# 搜索结果样例；流水线会就地改写文档的 content，使用时需逐个复制
+_SAMPLE_DOCS = (
+    {
+        "path": "/test/doc1.txt",
+        "filename": "doc1.txt",
+        "content": "测试文档内容",
+        "score": 0.9,
+    },
+)
+
+
+@pytest.fixture
+def mock_config():
+    """创建空配置，所有读取都回落到 RAGPipeline 自带的默认值"""
+    return FakeConfig()
+
+
+@pytest.fixture
+def mock_model_manager():
+    """创建模拟模型管理器"""
+    mm = Mock(spec=ModelManager)
+    mm.get_model_limits.return_value = _MODEL_LIMITS
+    mm.get_mode.return_value = SimpleNamespace(value="api")
+    # 每次调用都返回新的迭代器，多次生成不会拿到已耗尽的流
+    mm.generate.side_effect = lambda *args, **kwargs: iter(("测试", "回答"))
+    return mm
+
+
+@pytest.fixture
+def mock_search_engine():
+    """创建模拟搜索引擎"""
+    se = Mock(spec=SearchEngine)
+    # spec 只包含类属性，构造函数里设置的实例属性需要显式补上
+    se.index_manager = Mock()
+    se.reranker_manager = None
+    se.search.return_value = [dict(doc) for doc in _SAMPLE_DOCS]
+    return se
+
+
+@pytest.fixture
+def rag_pipeline(mock_model_manager, mock_config, mock_search_engine):
+    """创建 RAGPipeline 实例（隔离聊天记录库、显存管理和查询扩展）
+
+    Mock 均为函数级，各用例可自由修改返回值而不互相影响。
+    """
+    with patch.multiple(
+        "backend.core.rag_pipeline",
+        ChatHistoryDB=DEFAULT,
+        VRAMManager=DEFAULT,
+        QueryProcessor=DEFAULT,
+    ):
+        return RAGPipeline(mock_model_manager, mock_config, mock_search_engine)
 
 
 class TestRAGPipeline:
     """RAGPipeline 测试类"""
 
-    @pytest.fixture
-    def mock_config(self):
-        """创建模拟配置"""
-        config = Mock()
-        config.get.return_value = None
-        config.getint.return_value = 120
-        config.getboolean.return_value = False
-        return config
-
-    @pytest.fixture
-    def mock_model_manager(self):
-        """创建模拟模型管理器"""
-        mm = Mock()
-        mm.get_model_limits.return_value = {
-            "max_docs": 5,
-            "chunk_size": 2000,
-            "max_context": 4000,
-            "max_tokens": 500,
-            "temperature": 0.7,
-            "min_doc_score": 0.3,
-        }
-        mm.get_mode.return_value = Mock(value="api")
-        mm.generate.return_value = iter(["测试", "回答"])
-        return mm
-
-    @pytest.fixture
-    def mock_search_engine(self):
-        """创建模拟搜索引擎"""
-        se = Mock()
-        se.search.return_value = [
-            {
-                "path": "/test/doc1.txt",
-                "filename": "doc1.txt",
-                "content": "测试文档内容",
-                "score": 0.9,
-            }
-        ]
-        return se
-
-    @pytest.fixture
-    def rag_pipeline(self, mock_model_manager, mock_config, mock_search_engine):
-        """创建 RAGPipeline 实例"""
-        with patch("backend.core.rag_pipeline.ChatHistoryDB"):
-            with patch("backend.core.rag_pipeline.VRAMManager"):
-                with patch("backend.core.rag_pipeline.QueryProcessor"):
-                    pipeline = RAGPipeline(
-                        mock_model_manager, mock_config, mock_search_engine
-                    )
-                    return pipeline
-
     def test_init(self, rag_pipeline):
         """测试初始化"""
         assert rag_pipeline.model_manager is not None
@@ -71,29 +84,20 @@ class TestRAGPipeline:
         assert rag_pipeline.max_history_turns == 6
         assert rag_pipeline.max_history_chars == 800
 
-    def test_is_noise_query_empty(self, rag_pipeline):
-        """测试空查询检测"""
-        assert rag_pipeline._is_noise_query("")
-
-    def test_is_noise_query_whitespace(self, rag_pipeline):
-        """测试空白查询检测"""
-        assert rag_pipeline._is_noise_query("   ")
-
-    def test_is_noise_query_single_char(self, rag_pipeline):
-        """测试单字符查询检测"""
-        assert rag_pipeline._is_noise_query("a")
-
-    def test_is_noise_query_repeated_char(self, rag_pipeline):
-        """测试重复字符查询检测"""
-        assert rag_pipeline._is_noise_query("aa")
-
-    def test_is_noise_query_valid(self, rag_pipeline):
-        """测试有效查询"""
-        assert not rag_pipeline._is_noise_query("python")
-
-    def test_is_noise_query_chinese(self, rag_pipeline):
-        """测试中文查询"""
-        assert not rag_pipeline._is_noise_query("你好")
+    @pytest.mark.parametrize(
+        "query, expected",
+        [
+            pytest.param("", True, id="empty"),
+            pytest.param("   ", True, id="whitespace"),
+            pytest.param("a", True, id="single_char"),
+            pytest.param("aa", True, id="repeated_char"),
+            pytest.param("python", False, id="valid"),
+            pytest.param("你好", False, id="chinese"),
+        ],
+    )
+    def test_is_noise_query(self, rag_pipeline, query, expected):
+        """测试噪声查询检测"""
+        assert rag_pipeline._is_noise_query(query) is expected
 
     def test_strip_tags(self, rag_pipeline):
         """测试标签去除"""
@@ -108,53 +112,44 @@ class TestRAGPipeline:
         result = rag_pipeline._strip_tags(text)
         assert "\xa0" not in result
 
-    def test_has_query_overlap_exact(self, rag_pipeline):
-        """测试精确匹配"""
-        assert rag_pipeline._has_query_overlap("python guide", "python")
-
-    def test_has_query_overlap_token(self, rag_pipeline):
-        """测试token匹配"""
-        assert rag_pipeline._has_query_overlap("python_guide", "python guide")
-
-    def test_has_query_overlap_no_match(self, rag_pipeline):
-        """测试无匹配"""
-        assert not rag_pipeline._has_query_overlap("java guide", "python")
-
-    def test_has_query_overlap_empty(self, rag_pipeline):
-        """测试空查询"""
-        assert not rag_pipeline._has_query_overlap("", "test")
-        assert not rag_pipeline._has_query_overlap("test", "")
-
-    def test_render_template(self, rag_pipeline):
+    @pytest.mark.parametrize(
+        "text, query, expected",
+        [
+            pytest.param("python guide", "python", True, id="exact"),
+            pytest.param("python_guide", "python guide", True, id="token"),
+            pytest.param("java guide", "python", False, id="no_match"),
+            pytest.param("", "test", False, id="empty_text"),
+            pytest.param("test", "", False, id="empty_query"),
+        ],
+    )
+    def test_has_query_overlap(self, rag_pipeline, text, query, expected):
+        """测试查询与文本的重叠判断"""
+        assert rag_pipeline._has_query_overlap(text, query) is expected
+
+    @pytest.mark.parametrize(
+        "template, query, expected",
+        [
+            pytest.param("Hello {query}", "World", "Hello World", id="placeholder"),
+            pytest.param("", "test", "", id="empty"),
+            pytest.param("Hello World", "test", "Hello World", id="no_placeholder"),
+        ],
+    )
+    def test_render_template(self, rag_pipeline, template, query, expected):
         """测试模板渲染"""
-        template = "Hello {query}"
-        result = rag_pipeline._render_template(template, "World")
-        assert result == "Hello World"
-
-    def test_render_template_empty(self, rag_pipeline):
-        """测试空模板"""
-        result = rag_pipeline._render_template("", "test")
-        assert result == ""
-
-    def test_render_template_no_placeholder(self, rag_pipeline):
-        """测试无占位符模板"""
-        template = "Hello World"
-        result = rag_pipeline._render_template(template, "test")
-        assert result == "Hello World"
-
-    def test_is_small_talk_greeting(self, rag_pipeline):
-        """测试问候语检测"""
+        assert rag_pipeline._render_template(template, query) == expected
+
+    @pytest.mark.parametrize(
+        "query, expected",
+        [
+            pytest.param("hello", True, id="greeting"),
+            pytest.param("python tutorial", False, id="normal"),
+            pytest.param("", True, id="empty"),
+        ],
+    )
+    def test_is_small_talk(self, rag_pipeline, query, expected):
+        """测试闲聊检测"""
         rag_pipeline.greeting_keywords = ["hello", "hi"]
-        assert rag_pipeline._is_small_talk("hello")
-
-    def test_is_small_talk_normal(self, rag_pipeline):
-        """测试正常查询"""
-        rag_pipeline.greeting_keywords = ["hello"]
-        assert not rag_pipeline._is_small_talk("python tutorial")
-
-    def test_is_small_talk_empty(self, rag_pipeline):
-        """测试空查询"""
-        assert rag_pipeline._is_small_talk("")
+        assert rag_pipeline._is_small_talk(query) is expected
 
     def test_remove_file_extension(self, rag_pipeline):
         """测试文件扩展名移除"""
@@ -280,54 +275,12 @@ class TestRAGPipelineQuery:
     """RAGPipeline 查询测试"""
 
     @pytest.fixture
-    def mock_config(self):
-        config = Mock()
-        config.get.return_value = None
-        config.getint.return_value = 120
-        config.getboolean.return_value = False
-        return config
-
-    @pytest.fixture
-    def mock_model_manager(self):
-        mm = Mock()
-        mm.get_model_limits.return_value = {
-            "max_docs": 5,
-            "chunk_size": 2000,
-            "max_context": 4000,
-            "max_tokens": 500,
-            "temperature": 0.7,
-            "min_doc_score": 0.3,
-        }
-        mm.get_mode.return_value = Mock(value="api")
-        mm.generate.return_value = iter(["测试", "回答"])
-        return mm
-
-    @pytest.fixture
-    def mock_search_engine(self):
-        se = Mock()
-        se.search.return_value = [
-            {
-                "path": "/test/doc1.txt",
-                "filename": "doc1.txt",
-                "content": "测试文档内容",
-                "score": 0.9,
-            }
-        ]
-        return se
-
-    @pytest.fixture
-    def rag_pipeline(self, mock_model_manager, mock_config, mock_search_engine):
-        with patch("backend.core.rag_pipeline.ChatHistoryDB"):
-            with patch("backend.core.rag_pipeline.VRAMManager") as mock_vram:
-                mock_vram_instance = Mock()
-                mock_vram_instance.adjust_context_size.return_value = 2000
-                mock_vram.return_value = mock_vram_instance
-                with patch("backend.core.rag_pipeline.QueryProcessor"):
-                    pipeline = RAGPipeline(
-                        mock_model_manager, mock_config, mock_search_engine
-                    )
-                    pipeline.vram_manager = mock_vram_instance
-                    return pipeline
+    def rag_pipeline(self, rag_pipeline):
+        """查询流程需要显存管理器给出上下文预算"""
+        vram_manager = Mock()
+        vram_manager.adjust_context_size.return_value = 2000
+        rag_pipeline.vram_manager = vram_manager
+        return rag_pipeline
 
     def test_query_reset_command(self, rag_pipeline):
         """测试重置命令"""
@@ -390,41 +343,6 @@ class TestRAGPipelineQuery:
 class TestRAGPipelineDocumentProcessing:
     """RAGPipeline 文档处理测试"""
 
-    @pytest.fixture
-    def mock_config(self):
-        config = Mock()
-        config.get.return_value = None
-        config.getint.return_value = 120
-        config.getboolean.return_value = False
-        return config
-
-    @pytest.fixture
-    def mock_model_manager(self):
-        mm = Mock()
-        mm.get_model_limits.return_value = {
-            "max_docs": 5,
-            "chunk_size": 2000,
-            "max_context": 4000,
-            "max_tokens": 500,
-            "temperature": 0.7,
-            "min_doc_score": 0.3,
-        }
-        mm.get_mode.return_value = Mock(value="api")
-        return mm
-
-    @pytest.fixture
-    def mock_search_engine(self):
-        return Mock()
-
-    @pytest.fixture
-    def rag_pipeline(self, mock_model_manager, mock_config, mock_search_engine):
-        with patch("backend.core.rag_pipeline.ChatHistoryDB"):
-            with patch("backend.core.rag_pipeline.VRAMManager"):
-                with patch("backend.core.rag_pipeline.QueryProcessor"):
-                    return RAGPipeline(
-                        mock_model_manager, mock_config, mock_search_engine
-                    )
-
     def test_preprocess_content(self, rag_pipeline):
         """测试内容预处理"""
         content = "first paragraph\n\nsecond paragraph\n\n摘要: this is summary"
@@ -490,43 +408,10 @@ class TestRAGPipelineHistory:
     """RAGPipeline 历史记录测试"""
 
     @pytest.fixture
-    def mock_config(self):
-        config = Mock()
-        config.get.return_value = None
-        config.getint.return_value = 120
-        config.getboolean.return_value = False
-        return config
-
-    @pytest.fixture
-    def mock_model_manager(self):
-        mm = Mock()
-        mm.get_model_limits.return_value = {
-            "max_docs": 5,
-            "chunk_size": 2000,
-            "max_context": 4000,
-            "max_tokens": 500,
-            "temperature": 0.7,
-            "min_doc_score": 0.3,
-        }
-        mm.get_mode.return_value = Mock(value="api")
-        return mm
-
-    @pytest.fixture
-    def mock_search_engine(self):
-        return Mock()
-
-    @pytest.fixture
-    def rag_pipeline(self, mock_model_manager, mock_config, mock_search_engine):
-        with patch("backend.core.rag_pipeline.ChatHistoryDB") as mock_db:
-            mock_db_instance = Mock()
-            mock_db.return_value = mock_db_instance
-            with patch("backend.core.rag_pipeline.VRAMManager"):
-                with patch("backend.core.rag_pipeline.QueryProcessor"):
-                    pipeline = RAGPipeline(
-                        mock_model_manager, mock_config, mock_search_engine
-                    )
-                    pipeline.chat_db = mock_db_instance
-                    return pipeline
+    def rag_pipeline(self, rag_pipeline):
+        """历史记录用例直接配置 chat_db 的返回值"""
+        rag_pipeline.chat_db = Mock()
+        return rag_pipeline
 
     def test_build_history_empty(self, rag_pipeline):
         """测试空历史"""
@@ -574,41 +459,6 @@ class TestRAGPipelineHistory:
 class TestRAGPipelinePromptBuilding:
     """RAGPipeline 提示词构建测试"""
 
-    @pytest.fixture
-    def mock_config(self):
-        config = Mock()
-        config.get.return_value = None
-        config.getint.return_value = 120
-        config.getboolean.return_value = False
-        return config
-
-    @pytest.fixture
-    def mock_model_manager(self):
-        mm = Mock()
-        mm.get_model_limits.return_value = {
-            "max_docs": 5,
-            "chunk_size": 2000,
-            "max_context": 4000,
-            "max_tokens": 500,
-            "temperature": 0.7,
-            "min_doc_score": 0.3,
-        }
-        mm.get_mode.return_value = Mock(value="api")
-        return mm
-
-    @pytest.fixture
-    def mock_search_engine(self):
-        return Mock()
-
-    @pytest.fixture
-    def rag_pipeline(self, mock_model_manager, mock_config, mock_search_engine):
-        with patch("backend.core.rag_pipeline.ChatHistoryDB"):
-            with patch("backend.core.rag_pipeline.VRAMManager"):
-                with patch("backend.core.rag_pipeline.QueryProcessor"):
-                    return RAGPipeline(
-                        mock_model_manager, mock_config, mock_search_engine
-                    )
-
     def test_build_prompt_empty(self, rag_pipeline):
         """测试空提示词"""
         result = rag_pipeline._build_prompt("query", [], "", None)
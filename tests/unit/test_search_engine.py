@@ -1,10 +1,5 @@
-import sys
-from pathlib import Path
 from unittest.mock import Mock
 
-# 添加项目根目录到Python路径
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from backend.core.index_manager import IndexManager
 from backend.core.search_engine import SearchEngine
 from backend.utils.config_loader import ConfigLoader
@@ -1,12 +1,7 @@
 """TextChunker 单元测试"""
 
-import os
-import sys
-
 import pytest
 
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-
 from backend.core.text_chunker import TextChunk, TextChunker, chunk_document
 
 
@@ -1,13 +1,12 @@
 """VRAM Manager 单元测试"""
 
-import os
-import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from unittest.mock import Mock, patch
 
 import pytest
 
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-
 from backend.core.vram_manager import VRAMManager
 
 
@@ -220,9 +219,6 @@ class TestVRAMManagerEdgeCases:
 
     def test_concurrent_cache_access(self, vram_manager):
         """测试并发缓存访问 - 验证数据一致性和完整性"""
-        import threading
-        import time
-        from concurrent.futures import ThreadPoolExecutor, as_completed
 
         errors = []
         write_count = threading.Lock()